@@ -0,0 +1,54 @@
+import sys
+import os
+import time
+import argparse
+from PySide6.QtWidgets import QApplication, QLabel
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from native_glass import NativeGlassWidget, GlassStyle, GlassButton
+
+# Compara construir un sidebar elemento a elemento contra NativeGlassWidget.batch().
+# Funciona sin pantalla con: QT_QPA_PLATFORM=offscreen python examples/benchmark_batch.py
+
+
+def build(count, batched):
+    sidebar = NativeGlassWidget(style=GlassStyle.SIDEBAR)
+    sidebar.resize(240, 800)
+    sidebar.show()
+    QApplication.processEvents()
+
+    start = time.perf_counter()
+    if batched:
+        with sidebar.batch():
+            for i in range(count):
+                sidebar.addWidget(QLabel(f"Section {i}") if i % 10 == 0 else GlassButton(f"Item {i}"))
+    else:
+        for i in range(count):
+            sidebar.addWidget(QLabel(f"Section {i}") if i % 10 == 0 else GlassButton(f"Item {i}"))
+    # Incluye el layout/repintado pendiente
+    QApplication.processEvents()
+    elapsed = time.perf_counter() - start
+
+    sidebar.close()
+    sidebar.deleteLater()
+    QApplication.processEvents()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"platform={sys.platform} qpa={app.platformName()}")
+    for count in args.counts:
+        plain = build(count, batched=False)
+        batched = build(count, batched=True)
+        print(f"{count:6d} elements: one-by-one {plain * 1e3:8.1f} ms "
+              f"({plain / count * 1e6:6.1f} us/el) | batch {batched * 1e3:8.1f} ms "
+              f"({batched / count * 1e6:6.1f} us/el)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+# Mide el tiempo hasta el primer frame correcto en un arranque en frío
+# (proceso nuevo, desde antes de importar Qt hasta que el frame con el tema
+# que eligió el usuario está en pantalla). El usuario dejó la app en "light";
+# el tema por defecto de la app es "dark".
+#   - legacy:    set_mode("dark") -> show -> lee la preferencia -> set_mode("light")
+#   - persisted: GlassTheme.enable_persistence() restaura "light" antes del show
+# Funciona sin pantalla con: QT_QPA_PLATFORM=offscreen python examples/benchmark_cold_start.py
+
+USER_MODE = "light"
+
+
+def child(scenario, state_path, buttons):
+    from PySide6.QtWidgets import QApplication
+    import PySide6.QtAsyncio as QtAsyncio
+    import native_glass
+    from native_glass import NativeGlassWidget, GlassButton, GlassStyle, GlassTheme
+
+    app = QApplication(sys.argv)
+    counts = {"qpa": app.platformName(), "mode_changed": 0, "palette": 0, "native_effect": 0}
+    GlassTheme.mode_changed.connect(lambda mode: counts.__setitem__("mode_changed", counts["mode_changed"] + 1))
+    apply_palette = GlassTheme._apply_qt_palette
+    apply_native = native_glass.apply_glass_logic
+
+    def count_palette(mode):
+        counts["palette"] += 1
+        apply_palette(mode)
+
+    def count_native(target, style, mode):
+        # Solo cuenta las aplicaciones reales (las repetidas se descartan dentro)
+        before = dict(native_glass._APPLIED_GLASS)
+        apply_native(target, style, mode)
+        if dict(native_glass._APPLIED_GLASS) != before:
+            counts["native_effect"] += 1
+
+    GlassTheme._apply_qt_palette = count_palette
+    native_glass.apply_glass_logic = count_native
+
+    if scenario == "seed":
+        GlassTheme.enable_persistence(state_path)
+        GlassTheme.set_mode(USER_MODE)
+        return
+
+    if scenario == "persisted":
+        if not GlassTheme.enable_persistence(state_path):
+            GlassTheme.set_mode("dark")
+    else:
+        GlassTheme.set_mode("dark")
+
+    window = NativeGlassWidget(style=GlassStyle.SIDEBAR)
+    with window.batch():
+        for i in range(buttons):
+            window.addWidget(GlassButton(f"Item {i}"))
+    window.resize(400, 600)
+
+    async def run():
+        window.show()
+        await window.shown()
+        frames = 1
+        if GlassTheme.get_current_mode() != USER_MODE:
+            # La app recién ahora lee la preferencia del usuario: segundo pase
+            await GlassTheme.set_mode_async(USER_MODE)
+            frames += 1
+        counts["first_correct_frame"] = time.time()
+        counts["frames"] = frames
+
+    QtAsyncio.run(run(), keep_running=False)
+    print(json.dumps(counts))
+
+
+def launch(scenario, state_path, buttons):
+    start = time.time()
+    out = subprocess.run([sys.executable, __file__, "--child", scenario, "--state", state_path,
+                          "--buttons", str(buttons)], capture_output=True, text=True, check=True).stdout
+    counts = json.loads(out.strip().splitlines()[-1]) if scenario != "seed" else {}
+    if counts:
+        counts["ms"] = (counts.pop("first_correct_frame") - start) * 1e3
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--child")
+    parser.add_argument("--state")
+    parser.add_argument("--buttons", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.state, args.buttons)
+        return
+
+    state_path = os.path.join(tempfile.mkdtemp(), "native_glass_state.json")
+    launch("seed", state_path, args.buttons)
+    runs = {scenario: [launch(scenario, state_path, args.buttons) for _ in range(args.runs)]
+            for scenario in ["legacy", "persisted"]}
+    print(f"platform={sys.platform} qpa={runs['legacy'][-1]['qpa']} buttons={args.buttons} runs={args.runs}")
+    for scenario, results in runs.items():
+        ms = sorted(r["ms"] for r in results)[len(results) // 2]
+        last = results[-1]
+        print(f"{scenario:9}: first correct frame {ms:7.1f} ms (median) | frames shown={last['frames']} "
+              f"mode_changed={last['mode_changed']} palette passes={last['palette']} "
+              f"native effect applications={last['native_effect']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import sys
+import os
+import time
+import argparse
+from PySide6.QtWidgets import QApplication, QWidget, QLabel
+from PySide6.QtCore import QObject
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from native_glass import NativeGlassWidget, GlassStyle
+
+# Mide el coste de construir NativeGlassWidget: tiempo y QObjects por instancia.
+# Funciona sin pantalla con: QT_QPA_PLATFORM=offscreen python examples/benchmark_construction.py
+
+
+def build(count, with_content):
+    root = QWidget()
+    start = time.perf_counter()
+    for _ in range(count):
+        panel = NativeGlassWidget(style=GlassStyle.SIDEBAR, parent=root)
+        if with_content:
+            panel.addWidget(QLabel("Label"))
+    elapsed = time.perf_counter() - start
+    # Sin contar el root; con contenido, restamos el QLabel de cada panel
+    objects = len(root.findChildren(QObject)) - (count if with_content else 0)
+    root.deleteLater()
+    return elapsed, objects
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print(f"platform={sys.platform} qpa={app.platformName()} count={args.count}")
+    for with_content in (False, True):
+        elapsed, objects = build(args.count, with_content)
+        label = "with content" if with_content else "empty panel "
+        print(f"{label}: {elapsed / args.count * 1e6:8.1f} us/instance, "
+              f"{objects / args.count:4.1f} QObjects/instance")
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import sys
+import os
+import time
+import argparse
+from PySide6.QtWidgets import QApplication, QWidget, QGridLayout, QLabel
+from PySide6.QtCore import QTimer, QEventLoop
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from native_glass import NativeGlassWidget, GlassButton, GlassStyle
+
+# Compara el coste de repintar un dashboard de N paneles estáticos:
+#   - Paneles normales (cada label y botón se repinta widget a widget)
+#   - Paneles con rasterize=True (un blit por panel mientras nada cambie)
+# Funciona sin pantalla con: QT_QPA_PLATFORM=offscreen python examples/benchmark_raster.py
+
+
+def wait(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def run(count, labels, frames, rasterize):
+    root = QWidget()
+    grid = QGridLayout(root)
+    for i in range(count):
+        panel = NativeGlassWidget(style=GlassStyle.SIDEBAR, rasterize=rasterize)
+        with panel.batch():
+            for j in range(labels):
+                panel.addWidget(QLabel(f"Métrica {j}: {i * j}"))
+            panel.addWidget(GlassButton("Detalles"))
+        grid.addWidget(panel, i // 6, i % 6)
+    root.resize(1400, 900)
+    root.show()
+    # Deja que los paneles se asienten y se rastericen
+    wait(NativeGlassWidget.RASTER_SETTLE_MS * 3)
+    root.grab()
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        root.grab()
+    elapsed = (time.perf_counter() - start) / frames
+
+    root.close()
+    root.deleteLater()
+    QApplication.processEvents()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=36)
+    parser.add_argument("--labels", type=int, default=12)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"platform={sys.platform} qpa={app.platformName()} panels={args.count} labels={args.labels}")
+    plain = run(args.count, args.labels, args.frames, rasterize=False)
+    raster = run(args.count, args.labels, args.frames, rasterize=True)
+    print(f"widget-by-widget: {plain * 1e3:8.2f} ms/frame")
+    print(f"rasterized      : {raster * 1e3:8.2f} ms/frame  ({plain / raster:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import sys
+import os
+import time
+import argparse
+from PySide6.QtWidgets import QApplication, QWidget, QGridLayout, QGraphicsDropShadowEffect
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtCore import Qt, QRectF
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from native_glass import NativeGlassWidget, GlassStyle
+from native_glass.shadows import paint_shadow, shadow_margins
+
+# Compara el coste de repintar N popovers con sombra:
+#   - QGraphicsDropShadowEffect (renderiza el widget fuera de pantalla y lo difumina en cada paint)
+#   - Nine-patch cacheado de native_glass.shadows (9 blits por paint)
+# En Windows el nine-patch lo pinta NativeGlassWidget(style=POPOVER, shadow=True);
+# en el resto de plataformas shadow=True no hace nada (el material es nativo) y
+# se mide el mismo nine-patch desde una tarjeta propia.
+# Funciona sin pantalla con: QT_QPA_PLATFORM=offscreen python examples/benchmark_shadows.py
+
+# Donde NativeGlassWidget pinta su propia sombra (paneles hijos en Windows)
+NATIVE_SHADOW = sys.platform == "win32"
+
+BLUR = 18
+OFFSET = (0, 6)
+RADIUS = 8
+
+
+class Card(QWidget):
+    def __init__(self, cached_shadow):
+        super().__init__()
+        self._cached_shadow = cached_shadow
+        self.setFixedSize(180, 120)
+        if cached_shadow:
+            self.setContentsMargins(shadow_margins(BLUR, OFFSET))
+        else:
+            self.setContentsMargins(BLUR, BLUR, BLUR, BLUR)
+            effect = QGraphicsDropShadowEffect(self)
+            effect.setBlurRadius(BLUR * 2)
+            effect.setOffset(*OFFSET)
+            effect.setColor(QColor(0, 0, 0, 60))
+            self.setGraphicsEffect(effect)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        card = QRectF(self.contentsRect())
+        if self._cached_shadow:
+            paint_shadow(painter, card, RADIUS, BLUR, QColor(0, 0, 0, 60), OFFSET)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(255, 255, 255, 210))
+        painter.drawRoundedRect(card, RADIUS, RADIUS)
+
+
+def make_popover(cached_shadow):
+    if cached_shadow and NATIVE_SHADOW:
+        popover = NativeGlassWidget(style=GlassStyle.POPOVER,
+                                    shadow=dict(blur=BLUR, offset=OFFSET, color=QColor(0, 0, 0, 60)))
+        popover.setFixedSize(180, 120)
+        return popover
+    return Card(cached_shadow)
+
+
+def run(count, frames, cached_shadow):
+    root = QWidget()
+    grid = QGridLayout(root)
+    for i in range(count):
+        grid.addWidget(make_popover(cached_shadow), i // 10, i % 10)
+    root.show()
+    QApplication.processEvents()
+    root.grab()  # Calienta caches
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        root.grab()
+    elapsed = (time.perf_counter() - start) / frames
+
+    root.close()
+    root.deleteLater()
+    QApplication.processEvents()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    source = "NativeGlassWidget(shadow=True)" if NATIVE_SHADOW else "Card + paint_shadow (shadow=True is win32-only)"
+    print(f"platform={sys.platform} qpa={app.platformName()} popovers={args.count} nine-patch={source}")
+    effect = run(args.count, args.frames, cached_shadow=False)
+    cached = run(args.count, args.frames, cached_shadow=True)
+    print(f"QGraphicsDropShadowEffect: {effect * 1e3:8.2f} ms/frame")
+    print(f"nine-patch cached shadow : {cached * 1e3:8.2f} ms/frame  ({effect / cached:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,8 +21,9 @@ class ThemeSwitch(QWidget):
         super().__init__(parent)
         self.setFixedSize(50, 28)
         self.setCursor(Qt.PointingHandCursor)
-        self._is_dark = True 
-        self._thumb_x = 24.0
+        # Arranca donde quedó el tema (puede venir del estado persistido)
+        self._is_dark = GlassTheme.get_current_mode() == "dark"
+        self._thumb_x = 24.0 if self._is_dark else 4.0
         self._anim = QPropertyAnimation(self, b"thumb_x", self)
         self._anim.setDuration(250)
         self._anim.setEasingCurve(QEasingCurve.OutCubic)
@@ -89,31 +90,33 @@ class SimpleSidebar(NativeGlassWidget):
         self.contentLayout().setContentsMargins(16, 35, 16, 20)
         self.contentLayout().setSpacing(4)
         
-        lbl_title = QLabel("MATERIALS")
-        lbl_title.setStyleSheet("color: palette(text); font-weight: 900; font-size: 11px; margin-bottom: 8px; font-family: '.AppleSystemUIFont', 'Segoe UI'; border: none; letter-spacing: 1px;")
-        self.addWidget(lbl_title)
+        # Construcción por lotes: un solo layout y un solo estilado al final
+        with self.batch():
+            lbl_title = QLabel("MATERIALS")
+            lbl_title.setStyleSheet("color: palette(text); font-weight: 900; font-size: 11px; margin-bottom: 8px; font-family: '.AppleSystemUIFont', 'Segoe UI'; border: none; letter-spacing: 1px;")
+            self.addWidget(lbl_title)
         
-        for style in GlassStyle:
-            # USAMOS EL BOTÓN DE LA LIBRERÍA (Sin color_role = Automático B/N)
-            btn = GlassButton(style.value)
-            btn.clicked.connect(lambda checked=False, s=style: self.main_window.open_material_popup(s))
-            self.addWidget(btn)
+            for style in GlassStyle:
+                # USAMOS EL BOTÓN DE LA LIBRERÍA (Sin color_role = Automático B/N)
+                btn = GlassButton(style.value)
+                btn.clicked.connect(lambda checked=False, s=style: self.main_window.open_material_popup(s))
+                self.addWidget(btn)
         
-        self.contentLayout().addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
+            self.contentLayout().addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
         
-        lbl_mode = QLabel("Appearance")
-        lbl_mode.setStyleSheet("color: palette(text); opacity: 0.6; font-size: 11px; font-weight: 600; margin-bottom: 6px;")
-        self.addWidget(lbl_mode)
+            lbl_mode = QLabel("Appearance")
+            lbl_mode.setStyleSheet("color: palette(text); opacity: 0.6; font-size: 11px; font-weight: 600; margin-bottom: 6px;")
+            self.addWidget(lbl_mode)
         
-        self.theme_switch = ThemeSwitch()
-        self.addWidget(self.theme_switch, 0, Qt.AlignLeft)
+            self.theme_switch = ThemeSwitch()
+            self.addWidget(self.theme_switch, 0, Qt.AlignLeft)
         
-        self.contentLayout().addSpacing(20)
+            self.contentLayout().addSpacing(20)
 
-        # BOTÓN SALIR CON ROL 'DANGER' (Aquí está la magia)
-        btn_exit = GlassButton("Exit App", color_role="danger")
-        btn_exit.clicked.connect(QApplication.instance().quit)
-        self.addWidget(btn_exit)
+            # BOTÓN SALIR CON ROL 'DANGER' (Aquí está la magia)
+            btn_exit = GlassButton("Exit App", color_role="danger")
+            btn_exit.clicked.connect(QApplication.instance().quit)
+            self.addWidget(btn_exit)
 
 # --- MAIN ---
 class MainWindow(QMainWindow):
@@ -173,12 +176,14 @@ class MainWindow(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setApplicationName("NativeGlassDemo")
     font = app.font()
     font.setFamily("Segoe UI")
     app.setFont(font)
 
-    # Iniciar en Dark Mode
-    GlassTheme.set_mode("dark")
+    # Último tema usado (antes de crear ventanas); la primera vez, Dark Mode
+    if not GlassTheme.enable_persistence():
+        GlassTheme.set_mode("dark")
     
     window = MainWindow()
     window.show()
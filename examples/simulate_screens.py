@@ -0,0 +1,78 @@
+import sys
+import os
+import json
+import tempfile
+
+# Dos monitores simulados (100% y 200%) sobre la plataforma offscreen de Qt.
+# La escala va en logicalDpi: offscreen no pasa su "dpr" a las ventanas.
+SCREENS = {"screens": [
+    {"name": "Monitor-100", "x": 0, "y": 0, "width": 1280, "height": 800,
+     "logicalDpi": 96, "logicalBaseDpi": 96, "dpr": 1},
+    {"name": "Monitor-200", "x": 1280, "y": 0, "width": 1280, "height": 800,
+     "logicalDpi": 192, "logicalBaseDpi": 96, "dpr": 1},
+]}
+config = os.path.join(tempfile.gettempdir(), "native_glass_screens.json")
+with open(config, "w") as f:
+    json.dump(SCREENS, f)
+os.environ["QT_QPA_PLATFORM"] = f"offscreen:configfile={config}"
+
+from PySide6.QtWidgets import QApplication, QLabel
+from PySide6.QtCore import QTimer, QEventLoop
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from native_glass import NativeGlassWidget, GlassStyle, screen_tracker
+
+# Arrastra una ventana entre monitores con distinto DPR y muestra qué se invalida:
+# solo los paneles rasterizados de esa ventana, y los caches de los DPR que quedan sin uso.
+# Uso: python examples/simulate_screens.py
+
+
+def wait(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def make_window(title, x):
+    window = NativeGlassWidget(style=GlassStyle.SIDEBAR, rasterize=True)
+    window.setWindowTitle(title)
+    with window.batch():
+        for i in range(8):
+            window.addWidget(QLabel(f"{title}: fila {i}"))
+    window.move(x, 40)
+    window.resize(320, 240)
+    window.show()
+    return window
+
+
+def report(windows, label):
+    print(f"-- {label}")
+    for window in windows:
+        handle = window.windowHandle()
+        print(f"   {window.windowTitle():8} screen={handle.screen().name():12} "
+              f"dpr={screen_tracker().dpr(handle):.1f} raster_valid={window._raster_valid}")
+    print(f"   dprs en uso={sorted(screen_tracker().active_dprs())}")
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    screen_tracker().dpr_changed.connect(
+        lambda window, old, new: print(f"   dpr_changed: {old:.1f} -> {new:.1f}"))
+
+    left = make_window("left", 40)
+    right = make_window("right", 500)
+    wait(NativeGlassWidget.RASTER_SETTLE_MS * 3)
+    report([left, right], "inicio, ambas en Monitor-100")
+
+    left.windowHandle().setScreen(app.screens()[1])
+    app.processEvents()
+    report([left, right], "left arrastrada a Monitor-200")
+
+    wait(NativeGlassWidget.RASTER_SETTLE_MS * 3)
+    right.windowHandle().setScreen(app.screens()[1])
+    app.processEvents()
+    report([left, right], "right también en Monitor-200 (se purga el DPR 1.0)")
+
+
+if __name__ == "__main__":
+    main()
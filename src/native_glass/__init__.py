@@ -1,11 +1,23 @@
 import sys
 import os
+import json
+import weakref
 import ctypes
 from ctypes import c_int, byref, sizeof, Structure
 from enum import Enum
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QApplication, QPushButton
-from PySide6.QtCore import Qt, Signal, QObject, QEvent
-from PySide6.QtGui import QPalette, QColor, QPainter, QBrush, QPen
+from contextlib import contextmanager
+import shiboken6
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QApplication, QPushButton,
+                               QStyle, QStyleOptionButton, QStylePainter)
+from PySide6.QtCore import Qt, Signal, QObject, QEvent, QMargins, QPoint, QRect, QTimer, QCoreApplication, QStandardPaths
+from PySide6.QtGui import QPalette, QColor, QPainter, QBrush, QPen, QIcon, QWindow, QPixmap, QRegion, QPlatformSurfaceEvent
+
+from .icons import IconAtlas, GlassIconEngine
+from .animation import GlassAnimator
+from .shadows import paint_shadow, shadow_margins, purge_dprs as _purge_shadow_dprs
+from .screens import screen_tracker
+from .cache import PixmapCache
+from .aio import create_future, resolve, after_frame, wait_signal, call_after_frame
 
 # --- 1. API DWM WINDOWS (Directa, sin archivos extra) ---
 if sys.platform == "win32":
@@ -34,28 +46,169 @@ class GlassStyle(Enum):
 # --- 3. MOTOR DE TEMAS ---
 class ThemeManager(QObject):
     mode_changed = Signal(str)
+    STATE_VERSION = 2
+    # Consumidores registrados por debajo de los cuales no se barre
+    SWEEP_MIN = 256
 
     def __init__(self):
         super().__init__()
         self._mode = "system"
+        self._real_mode = None
+        self._palette_mode = None
         self._semantic_colors = {}
         self._assets_path = "assets"
+        self._icon_atlas = IconAtlas(self)
+        self._defer_depth = 0
+        self._deferred = {}
+        self._scopes = weakref.WeakSet()
+        # Dependencias color-rol: id(consumidor) -> (weakref, {rol: (modo, widget, rgba)})
+        self._tracking = None
+        self._dependencies = {}
+        self._role_consumers = {}
+        # Tamaño de la tabla al que toca barrer consumidores destruidos
+        self._sweep_at = self.SWEEP_MIN
+        # Paletas ya calculadas por modo
+        self._compiled_palettes = {}
+        self._state_path = None
         self.register_color("btn_hover", day="#E5E5E5", night="#3A3A3A")
 
+    @contextmanager
+    def deferred_styling(self):
+        """
+        Agrupa el estilado de los componentes creados dentro del bloque:
+        cada uno se estila una sola vez al salir, en una única pasada.
+        """
+        self._defer_depth += 1
+        try:
+            yield
+        finally:
+            self._defer_depth -= 1
+            if self._defer_depth == 0:
+                self._flush_deferred()
+
+    def _defer_style(self, consumer):
+        # True si el estilado queda pendiente para el final del lote
+        if not self._defer_depth:
+            return False
+        self._deferred[id(consumer)] = consumer
+        return True
+
+    def _flush_deferred(self):
+        pending, self._deferred = self._deferred, {}
+        for consumer in pending.values():
+            if shiboken6.isValid(consumer):
+                consumer._apply_theme_style()
+
     def set_assets_path(self, path):
         self._assets_path = path
 
     def set_mode(self, mode):
+        old_mode = self._real_mode
         self._mode = mode
         self._real_mode = self.get_current_mode()
+        if self._real_mode == old_mode and self._palette_mode == self._real_mode:
+            # Nada cambió: ni paleta, ni señales, ni repolish
+            return
         self._apply_qt_palette(self._real_mode)
         self.mode_changed.emit(self._real_mode)
+        self._notify_changed(self._changed_roles(old_mode, self._real_mode))
+        if self._state_path is not None:
+            self.save_state()
         
         app = QApplication.instance()
-        if app:
+        # Apps solo-QML (QGuiApplication) no tienen widgets que refrescar
+        if isinstance(app, QApplication):
             for widget in app.topLevelWidgets():
                 self._force_style_refresh(widget)
 
+    async def set_mode_async(self, mode):
+        """
+        Como set_mode, pero se puede esperar: resuelve cuando terminaron las
+        transiciones de color y el frame con el tema nuevo llegó a pantalla.
+        Devuelve el modo resuelto.
+        """
+        self.set_mode(mode)
+        if not GlassAnimator.is_idle():
+            await wait_signal(GlassAnimator.idle)
+        await after_frame()
+        return self._real_mode
+
+    # --- ESTADO PERSISTIDO (arranque en frío) ---
+    def enable_persistence(self, path=None):
+        """
+        Guarda el modo y los colores semánticos en un JSON local y, si existe,
+        los aplica ahora mismo. Llamarlo al arrancar, con la QApplication ya creada
+        y antes de crear ventanas: la primera ventana nace con el modo correcto,
+        con un solo pase de estilos.
+        Devuelve True si se restauró un estado guardado.
+        """
+        if path is None:
+            folder = QStandardPaths.writableLocation(QStandardPaths.AppConfigLocation)
+            path = os.path.join(folder, "native_glass_state.json")
+        first = self._state_path is None
+        # Se carga antes de fijar la ruta: restaurar no necesita volver a escribir
+        self._state_path = None
+        restored = self._load_state(path)
+        self._state_path = path
+        app = QCoreApplication.instance()
+        if first and app is not None:
+            # Los colores registrados durante la sesión se guardan al salir
+            app.aboutToQuit.connect(self.save_state)
+        return restored
+
+    def save_state(self):
+        if self._state_path is None:
+            return
+        # La paleta no se guarda: sale de constantes y una copia vieja solo podría quedar desfasada
+        state = {
+            "version": self.STATE_VERSION,
+            "mode": self._mode,
+            "colors": {name: {m: QColor(c).name(QColor.HexArgb) for m, c in pair.items()}
+                       for name, pair in self._semantic_colors.items()},
+        }
+        try:
+            os.makedirs(os.path.dirname(self._state_path) or ".", exist_ok=True)
+            tmp_path = self._state_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._state_path)
+        except OSError:
+            # Sin cache el arranque solo es más lento, nunca incorrecto
+            pass
+
+    def _load_state(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not self._valid_state(state):
+            # Archivo ajeno, a medias o de otra versión: se arranca como si no existiera
+            return False
+
+        # Lo registrado por código en esta sesión manda sobre lo guardado
+        for name, pair in state["colors"].items():
+            self._semantic_colors.setdefault(name, {"light": pair["light"], "dark": pair["dark"]})
+        self.set_mode(state["mode"])
+        return True
+
+    def _valid_state(self, state):
+        if not isinstance(state, dict) or state.get("version") != self.STATE_VERSION:
+            return False
+        if state.get("mode") not in ["light", "dark", "system"]:
+            return False
+        colors = state.get("colors")
+        if not isinstance(colors, dict):
+            return False
+        for name, pair in colors.items():
+            if not isinstance(pair, dict):
+                return False
+            for mode in ["light", "dark"]:
+                value = pair.get(mode)
+                if not isinstance(value, str) or not QColor.isValidColorName(value):
+                    return False
+        return True
+
     def _force_style_refresh(self, widget):
         widget.style().unpolish(widget)
         widget.style().polish(widget)
@@ -64,7 +217,12 @@ class ThemeManager(QObject):
             child.style().polish(child)
         widget.update()
 
-    def get_current_mode(self):
+    def get_current_mode(self, widget=None):
+        # Si el widget vive dentro de un ThemeScope, manda el scope más cercano
+        if widget is not None:
+            scope = self.scope_for(widget)
+            if scope is not None:
+                return scope.get_current_mode()
         if self._mode in ["dark", "light"]:
             return self._mode
         app = QApplication.instance()
@@ -78,13 +236,145 @@ class ThemeManager(QObject):
         if night is None:
             night = self._calculate_dark_variant(day)
         self._semantic_colors[name] = {"light": day, "dark": night}
+        if name in self._role_consumers:
+            self._notify_changed([name])
 
-    def get_color(self, name):
-        mode = self.get_current_mode()
+    def get_color(self, name, mode=None, widget=None):
+        color = self._resolve_color(name, mode, widget)
+        if self._tracking is not None:
+            self._tracking[name] = (mode, weakref.ref(widget) if widget is not None else None, color.rgba())
+        return color
+
+    def _resolve_color(self, name, mode=None, widget=None):
+        scope = self.scope_for(widget) if widget is not None else None
+        if mode is None:
+            mode = scope.get_current_mode() if scope else self.get_current_mode()
+        # Los colores de los scopes tapan a los globales (gana el más cercano)
+        while scope is not None:
+            if name in scope._colors:
+                return QColor(scope._colors[name][mode])
+            scope = scope.parent_scope()
         if name in self._semantic_colors:
             return QColor(self._semantic_colors[name][mode])
+        # Roles de paleta estilo QSS: "palette(text)", "palette(window)"...
+        if name.startswith("palette(") and name.endswith(")"):
+            role = name[len("palette("):-1]
+            colors = self._palette_colors(mode)
+            if role in colors:
+                return QColor(colors[role])
         return QColor(name)
 
+    @contextmanager
+    def tracking(self, consumer):
+        """
+        Registra qué roles lee 'consumer' (via get_color) dentro del bloque.
+        Ante un cambio de modo o de color solo se llama a consumer._on_colors_changed()
+        si alguno de SUS roles resuelve a un valor distinto.
+        """
+        previous = self._tracking
+        dependencies = {}
+        self._tracking = dependencies
+        try:
+            yield
+        finally:
+            self._tracking = previous
+            key = id(consumer)
+            entry = self._dependencies.get(key)
+            if entry is not None and entry[0]() is consumer:
+                ref = entry[0]
+            else:
+                ref = weakref.ref(consumer)
+                if len(self._dependencies) >= self._sweep_at:
+                    self._sweep_consumers()
+            self._dependencies[key] = (ref, dependencies)
+            for name in dependencies:
+                self._role_consumers.setdefault(name, set()).add(key)
+
+    def _sweep_consumers(self):
+        # Sin conectar destroyed por consumidor (cada connect encarece el siguiente):
+        # se barre cuando la tabla dobla su tamaño, coste amortizado constante.
+        for key, (ref, _) in list(self._dependencies.items()):
+            consumer = ref()
+            if consumer is None or not shiboken6.isValid(consumer):
+                self._forget_consumer(key)
+        self._sweep_at = max(self.SWEEP_MIN, 2 * len(self._dependencies))
+
+    def _forget_consumer(self, key):
+        entry = self._dependencies.pop(key)
+        for name in entry[1]:
+            consumers = self._role_consumers.get(name)
+            if consumers is not None:
+                consumers.discard(key)
+                if not consumers:
+                    del self._role_consumers[name]
+
+    def _changed_roles(self, old_mode, new_mode):
+        if old_mode is None:
+            return list(self._role_consumers)
+        changed = [name for name in self._role_consumers
+                   if self._resolve_color(name, old_mode).rgba() != self._resolve_color(name, new_mode).rgba()]
+        # Un scope que hereda el modo puede sobrescribir el rol con otros valores
+        for scope in list(self._scopes):
+            changed.extend(name for name in scope._colors if name in self._role_consumers)
+        return changed
+
+    def _notify_changed(self, roles):
+        # El coste escala con los consumidores de los roles cambiados, no con la app
+        keys = set()
+        for name in set(roles):
+            consumers = self._role_consumers.get(name, set())
+            for key in list(consumers):
+                entry = self._dependencies.get(key)
+                if entry is None or name not in entry[1]:
+                    consumers.discard(key)
+                else:
+                    keys.add(key)
+        for key in keys:
+            entry = self._dependencies.get(key)
+            if entry is None:
+                continue
+            consumer = entry[0]()
+            if consumer is None or not shiboken6.isValid(consumer):
+                self._forget_consumer(key)
+                continue
+            if self._dependencies_changed(entry[1]):
+                consumer._on_colors_changed()
+
+    def _refresh_if_changed(self, consumer):
+        entry = self._dependencies.get(id(consumer))
+        if entry is None or entry[0]() is not consumer or self._dependencies_changed(entry[1]):
+            consumer._on_colors_changed()
+
+    def _dependencies_changed(self, dependencies):
+        for name, (mode, widget_ref, rgba) in dependencies.items():
+            widget = widget_ref() if widget_ref is not None else None
+            if self._resolve_color(name, mode, widget).rgba() != rgba:
+                return True
+        return False
+
+    def scope_for(self, widget):
+        """ThemeScope más cercano del widget (él mismo o un ancestro), o None."""
+        if not self._scopes:
+            # Sin scopes no hace falta recorrer ancestros
+            return None
+        while widget is not None:
+            scope = getattr(widget, "_theme_scope", None)
+            if scope is not None:
+                return scope
+            widget = widget.parentWidget()
+        return None
+
+    def get_icon(self, filename, role="palette(text)"):
+        """
+        Icono SVG monocromático teñido con un color semántico.
+        Reemplaza las copias '_dark' de get_asset: un solo archivo por icono.
+        """
+        path = os.path.join(self._assets_path, filename)
+        return QIcon(GlassIconEngine(self._icon_atlas, path, role))
+
+    def icon_atlas(self):
+        return self._icon_atlas
+
     def get_asset(self, filename):
         mode = self.get_current_mode()
         if mode == "light":
@@ -97,151 +387,711 @@ class ThemeManager(QObject):
 
     def _calculate_dark_variant(self, hex_color):
         c = QColor(hex_color)
-        h, s, lum = c.getHslF()
+        h, s, lum, _ = c.getHslF()
         new_lum = 1.0 - lum
         new_s = s * 0.8 if new_lum < 0.5 else s
         return QColor.fromHslF(h, new_s, new_lum).name()
 
-    def _apply_qt_palette(self, mode):
-        app = QApplication.instance()
-        if not app: return
-        palette = QPalette()
+    def _palette_colors(self, mode):
+        colors = self._compiled_palettes.get(mode)
+        if colors is not None:
+            return colors
         # IMPORTANTE: Base transparente global
         base = QColor(0, 0, 0, 0)
         text = QColor(255, 255, 255) if mode == "dark" else QColor(0, 0, 0)
-            
-        palette.setColor(QPalette.WindowText, text)
-        palette.setColor(QPalette.Text, text)
-        palette.setColor(QPalette.ButtonText, text)
-        palette.setColor(QPalette.Window, base)
-        palette.setColor(QPalette.Base, base)
-        app.setPalette(palette)
+        colors = {
+            "window-text": text,
+            "text": text,
+            "button-text": text,
+            "window": base,
+            "base": base,
+        }
+        self._compiled_palettes[mode] = colors
+        return colors
+
+    def _build_palette(self, mode):
+        colors = self._palette_colors(mode)
+        palette = QPalette()
+        palette.setColor(QPalette.WindowText, colors["window-text"])
+        palette.setColor(QPalette.Text, colors["text"])
+        palette.setColor(QPalette.ButtonText, colors["button-text"])
+        palette.setColor(QPalette.Window, colors["window"])
+        palette.setColor(QPalette.Base, colors["base"])
+        return palette
+
+    def _apply_qt_palette(self, mode):
+        app = QApplication.instance()
+        if not app: return
+        app.setPalette(self._build_palette(mode))
+        self._palette_mode = mode
 
 GlassTheme = ThemeManager()
 
+# Al cambiar de monitor, los caches sueltan los DPR que ya no usa ninguna ventana
+screen_tracker().add_purger(_purge_shadow_dprs)
+screen_tracker().add_purger(lambda keep: GlassTheme.icon_atlas().purge_dprs(keep))
+
+# --- 3.1 TEMAS POR SUBÁRBOL ---
+class ThemeScope(QObject):
+    """
+    Tema local para un subárbol de widgets (p.ej. un panel multimedia siempre oscuro).
+    Sobrescribe el modo y/o colores semánticos; las búsquedas de GlassTheme
+    se resuelven por el scope ancestro más cercano.
+    Un cambio en el scope solo recorre su subárbol, no toda la aplicación.
+    """
+    mode_changed = Signal(str)
+
+    def __init__(self, widget, mode=None, colors=None):
+        super().__init__(widget)
+        self._widget = widget
+        self._mode = None
+        self._colors = {}
+        widget._theme_scope = self
+        GlassTheme._scopes.add(self)
+        for name, value in (colors or {}).items():
+            if isinstance(value, (tuple, list)):
+                self._store_color(name, *value)
+            else:
+                self._store_color(name, value)
+        self.set_mode(mode)
+
+    def widget(self):
+        return self._widget
+
+    def mode(self):
+        return self._mode
+
+    def set_mode(self, mode):
+        """'dark', 'light' o None para heredar del scope padre / tema global."""
+        self._mode = mode if mode in ["dark", "light"] else None
+        self._propagate()
+
+    def get_current_mode(self):
+        if self._mode is not None:
+            return self._mode
+        parent = self.parent_scope()
+        return parent.get_current_mode() if parent else GlassTheme.get_current_mode()
+
+    def parent_scope(self):
+        parent = self._widget.parentWidget()
+        return GlassTheme.scope_for(parent) if parent is not None else None
+
+    def register_color(self, name, day, night=None):
+        self._store_color(name, day, night)
+        self._propagate()
+
+    def detach(self):
+        GlassTheme._scopes.discard(self)
+        self._widget._theme_scope = None
+        self._mode = None
+        self._colors = {}
+        self._propagate()
+        self.deleteLater()
+
+    def _store_color(self, name, day, night=None):
+        if night is None:
+            night = GlassTheme._calculate_dark_variant(day)
+        self._colors[name] = {"light": day, "dark": night}
+
+    def _propagate(self):
+        root = self._widget
+        mode = self.get_current_mode()
+        if self._mode is not None:
+            root.setPalette(GlassTheme._build_palette(mode))
+        else:
+            # Paleta vacía = volver a heredar del padre
+            root.setPalette(QPalette())
+
+        # Solo el subárbol: el coste escala con su tamaño, no con la app
+        for widget in [root] + root.findChildren(QWidget):
+            handler = getattr(widget, "_on_scope_changed", None)
+            if handler is not None:
+                handler(mode)
+        self.mode_changed.emit(mode)
+
 # --- 4. COMPONENTES UI ---
+# El color del texto y el fondo de hover NO van en el QSS: los anima GlassAnimator
+# y se aplican en paintEvent, así no hay que recompilar la hoja de estilos
+# en cada frame (y el repolish del tema no los pisa).
+_GLASS_BUTTON_QSS = """
+    QPushButton {
+        background-color: transparent;
+        border: none;
+        border-radius: 6px;
+        text-align: left;
+        padding-left: 15px;
+        font-size: 13px;
+        font-family: '.AppleSystemUIFont', 'Segoe UI';
+        opacity: 0.9;
+    }
+    QPushButton:hover {
+        font-weight: 600;
+    }
+"""
+
 class GlassButton(QPushButton):
+    HOVER_DURATION = 120
+    THEME_DURATION = 250
+
     def __init__(self, text, color_role=None, parent=None):
         super().__init__(text, parent)
         self.setCursor(Qt.PointingHandCursor)
         self.setFixedHeight(34)
         self._color_role = color_role
-        GlassTheme.mode_changed.connect(self._update_style)
+        self._hover_color = QColor(Qt.transparent)
+        self._text_color = QColor()
+        self._styled = False
+        # Sin mode_changed: GlassTheme avisa solo si cambia un rol que usamos
+        if not GlassTheme._defer_style(self):
+            self._apply_theme_style()
+
+    def _apply_theme_style(self):
+        if not self._styled:
+            self._styled = True
+            self.setStyleSheet(_GLASS_BUTTON_QSS)
+        self._update_style(animate=False)
+
+    def _update_style(self, mode=None, animate=True):
+        if not self._styled or GlassTheme._defer_style(self):
+            # Se estilará al cerrar el lote (deferred_styling)
+            return
+        with GlassTheme.tracking(self):
+            text_col = GlassTheme.get_color(self._color_role or "palette(text)", widget=self)
+            hover_col = self._hover_target()
+        duration = self.THEME_DURATION if animate and self.isVisible() else 0
+        GlassAnimator.animate_color(self, "text", self._text_color if self._text_color.isValid() else text_col,
+                                    text_col, duration)
+        GlassAnimator.animate_color(self, "hover", self._hover_color, hover_col, duration)
+
+    def _on_colors_changed(self):
         self._update_style()
 
-    def _update_style(self, mode=None):
-        if self._color_role:
-            text_col = GlassTheme.get_color(self._color_role).name()
-        else:
-            text_col = "palette(text)"
-        hover_col = GlassTheme.get_color("btn_hover").name()
-        
-        self.setStyleSheet(f"""
-            QPushButton {{
-                color: {text_col};
-                background-color: transparent;
-                border: none;
-                border-radius: 6px;
-                text-align: left;
-                padding-left: 15px;
-                font-size: 13px;
-                font-family: '.AppleSystemUIFont', 'Segoe UI';
-                opacity: 0.9;
-            }}
-            QPushButton:hover {{
-                background-color: {hover_col};
-                font-weight: 600;
-            }}
-        """)
+    def _hover_target(self):
+        hover_col = GlassTheme.get_color("btn_hover", widget=self)
+        if not self.underMouse():
+            # Mismo color con alpha 0: el fade no pasa por negro
+            hover_col.setAlpha(0)
+        return hover_col
+
+    def _on_scope_changed(self, mode):
+        GlassTheme._refresh_if_changed(self)
+
+    def event(self, event):
+        if event.type() == QEvent.ParentChange:
+            # addWidget() reparenta botones creados sin padre: puede haber entrado en un scope
+            GlassTheme._refresh_if_changed(self)
+        return super().event(event)
+
+    def _animation_step(self, channel, color):
+        if channel == "text":
+            self._text_color = color
+        elif channel == "hover":
+            self._hover_color = color
+        self.update()
+        _invalidate_raster_ancestors(self)
+
+    def enterEvent(self, event):
+        super().enterEvent(event)
+        GlassAnimator.animate_color(self, "hover", self._hover_color,
+                                    self._hover_target(), self.HOVER_DURATION)
+
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        GlassAnimator.animate_color(self, "hover", self._hover_color,
+                                    self._hover_target(), self.HOVER_DURATION)
+
+    def paintEvent(self, event):
+        if self._hover_color.alpha():
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self._hover_color)
+            painter.drawRoundedRect(self.rect(), 6, 6)
+            painter.end()
+
+        # Igual que QPushButton.paintEvent, pero con nuestro color de texto
+        option = QStyleOptionButton()
+        self.initStyleOption(option)
+        if self._text_color.isValid():
+            option.palette.setColor(QPalette.ButtonText, self._text_color)
+        with GlassTheme.icon_atlas().painting(self):
+            QStylePainter(self).drawControl(QStyle.CE_PushButton, option)
 
 # --- 5. WIDGET NATIVO ---
+# Cache global (acotada en bytes) de los subárboles rasterizados: id(widget) -> QPixmap
+_RASTER_CACHE = PixmapCache(max_bytes=32 * 1024 * 1024)
+_RASTERIZED = weakref.WeakSet()
+
+def set_raster_cache_limit(max_bytes):
+    _RASTER_CACHE.set_max_bytes(max_bytes)
+
+def _invalidate_raster_ancestors(widget):
+    # Los componentes de la librería avisan a sus paneles rasterizados al cambiar
+    if not _RASTERIZED:
+        return
+    parent = widget.parentWidget()
+    while parent is not None:
+        if parent in _RASTERIZED:
+            parent.invalidateRaster()
+        parent = parent.parentWidget()
+
+# Qt >= 6.6 avisa de cambios de escala dentro de la misma pantalla
+_DPR_CHANGE_EVENT = getattr(QEvent, "DevicePixelRatioChange", None)
+
+# Eventos de un descendiente que implican que su aspecto pudo cambiar
+_RASTER_INVALIDATING_EVENTS = {
+    QEvent.ChildAdded, QEvent.ChildRemoved, QEvent.Show, QEvent.Hide,
+    QEvent.Resize, QEvent.Move, QEvent.LayoutRequest, QEvent.StyleChange,
+    QEvent.PaletteChange, QEvent.FontChange, QEvent.EnabledChange,
+    QEvent.Enter, QEvent.Leave, QEvent.MouseButtonPress, QEvent.MouseButtonRelease,
+    QEvent.FocusIn, QEvent.FocusOut, QEvent.KeyPress, QEvent.DynamicPropertyChange,
+}
+
+def _on_window_dpr_changed(window, old_dpr, new_dpr):
+    # Solo se re-rasterizan los paneles de la ventana que cambió de pantalla
+    for panel in list(_RASTERIZED):
+        if panel.window().windowHandle() is window:
+            panel.invalidateRaster()
+
+screen_tracker().dpr_changed.connect(_on_window_dpr_changed)
+
 class NativeGlassWidget(QWidget):
+    THEME_DURATION = 250
+    # Tiempo sin cambios antes de volver a rasterizar (no re-rasterizamos durante animaciones)
+    RASTER_SETTLE_MS = 150
+
     # AQUI ESTA EL CAMBIO: Agregamos tint_color=None al constructor
     def __init__(self, style=GlassStyle.SIDEBAR, tint_color=None, parent=None, **kwargs):
         super().__init__(parent)
         self._style = style
         self._tint_color = tint_color # Guardamos el tinte personalizado
+        # Colores actuales del tinte (los anima GlassAnimator al cambiar de tema)
+        self._fill, self._border = _material_colors(style, GlassTheme.get_current_mode(), tint_color)
+        self._theme_scope = None
+        self._batch_depth = 0
         self._border_radius = 0
         self._corner_mask = kwargs.get('corner_mask', None)
+        # Sombra propia del material (en vez de QGraphicsDropShadowEffect)
+        self._shadow = None
+        self._shadow_reserved = QMargins()
 
         GlassTheme.mode_changed.connect(self._on_mode_changed)
         
-        # --- CONFIGURACIÓN TRANSPARENCIA (La del Script V3) ---
+        # --- CONFIGURACIÓN TRANSPARENCIA ---
+        # Sin hoja de estilos por instancia (cada setStyleSheet crea su propio
+        # QStyleSheetStyle): basta con atributos y no rellenar el fondo.
         self.setAttribute(Qt.WA_TranslucentBackground, True)
         self.setAttribute(Qt.WA_NoSystemBackground, True)
-        self.setStyleSheet("background: transparent;")
+        self.setAutoFillBackground(False)
         
+        # El layout (y en macOS el escudo nativo) se crean al primer uso:
+        # un panel sin contenido no paga por objetos que no necesita.
         self._layout_proxy = None
+        self._root_layout = None
         self._shield = None
 
         if sys.platform == "darwin":
-            # macOS: Código original intacto
             self.setAttribute(Qt.WA_NativeWindow, True)
-            
-            self._root_layout = QVBoxLayout(self)
-            self._root_layout.setContentsMargins(0, 0, 0, 0)
-            self._root_layout.setSpacing(0)
-            
-            self._shield = QWidget()
-            self._shield.setAttribute(Qt.WA_NativeWindow, True)
-            self._shield.setAttribute(Qt.WA_TranslucentBackground, True)
-            self._shield.setStyleSheet("background: transparent;")
-            
-            self._root_layout.addWidget(self._shield)
-            self._layout_proxy = QVBoxLayout(self._shield)
-            self.content_layout = self._layout_proxy
-            
-        elif sys.platform == "win32":
-            # Windows: Layout directo
-            self._layout_proxy = QVBoxLayout(self)
-            self.content_layout = self._layout_proxy
 
-        self._layout_proxy.setContentsMargins(0, 0, 0, 0)
-        self._layout_proxy.setSpacing(0)
+        # Primer frame tras mostrarse: 0 oculto, 1 pintado (falta volcarlo), 2 en pantalla
+        self._frame_state = 0
+        self._shown_waiters = []
+
+        self._rasterize = False
+        self._raster_valid = False
+        self._raster_key = None
+        self._rendering_raster = False
+        self._raster_timer = None
+        # Descendientes cuyo pintado ya va en el último blit (ver _paint_raster)
+        self._raster_pending = set()
+        self._raster_subtree = frozenset()
+        if kwargs.get('rasterize', False):
+            self.setRasterize(True)
+
+        shadow = kwargs.get('shadow', None)
+        if shadow:
+            self.setShadow(**(shadow if isinstance(shadow, dict) else {}))
 
     # --- API ---
     def addWidget(self, widget, stretch=0, alignment=Qt.Alignment()):
-        self._layout_proxy.addWidget(widget, stretch, alignment)
+        self._ensure_layout().addWidget(widget, stretch, alignment)
 
     def addLayout(self, layout, stretch=0):
-        self._layout_proxy.addLayout(layout, stretch)
+        self._ensure_layout().addLayout(layout, stretch)
 
     def addStretch(self, stretch=0):
-        self._layout_proxy.addStretch(stretch)
+        self._ensure_layout().addStretch(stretch)
         
     def addSpacing(self, size):
-        self._layout_proxy.addSpacing(size)
+        self._ensure_layout().addSpacing(size)
         
     def contentLayout(self):
-        return self._layout_proxy
+        return self._ensure_layout()
+
+    @property
+    def content_layout(self):
+        return self._ensure_layout()
+
+    @content_layout.setter
+    def content_layout(self, layout):
+        self.setLayout(layout)
 
     def setLayout(self, layout):
-        if sys.platform == "darwin":
-            QWidget().setLayout(self._layout_proxy) 
-            self._layout_proxy = layout
-            self._shield.setLayout(layout)
-            self.content_layout = layout
-        else:
-            if self.layout():
-                QWidget().setLayout(self.layout())
+        old = self._layout_proxy
+        if old is None and sys.platform != "darwin":
+            old = self.layout()
+        self._layout_proxy = None
+        if old is not None and old is not layout:
+            # Qt no permite reemplazar un layout: destruimos el anterior
+            # junto con sus widgets, como hacía QWidget().setLayout(old)
+            self._discard_layout_widgets(old, layout)
+            shiboken6.delete(old)
+        self._install_layout(layout)
+
+    @staticmethod
+    def _discard_layout_widgets(old, keep):
+        while old.count():
+            item = old.takeAt(0)
+            widget = item.widget()
+            if widget is not None and keep.indexOf(widget) < 0:
+                widget.hide()
+                widget.deleteLater()
+            elif item.layout() is not None:
+                NativeGlassWidget._discard_layout_widgets(item.layout(), keep)
+
+    def _ensure_layout(self):
+        if self._layout_proxy is None:
+            layout = QVBoxLayout()
+            layout.setContentsMargins(0, 0, 0, 0)
+            layout.setSpacing(0)
+            self._install_layout(layout)
+        return self._layout_proxy
+
+    def _install_layout(self, layout):
+        host = self._content_host()
+        if host is self:
             super().setLayout(layout)
-            self._layout_proxy = layout
-            self.content_layout = layout
+        else:
+            host.setLayout(layout)
+        self._layout_proxy = layout
+
+    def _content_host(self):
+        if sys.platform != "darwin":
+            # Windows / otros: Layout directo
+            return self
+        if self._shield is None:
+            # macOS: escudo nativo por encima del NSVisualEffectView
+            self._root_layout = QVBoxLayout(self)
+            self._root_layout.setContentsMargins(0, 0, 0, 0)
+            self._root_layout.setSpacing(0)
+            
+            self._shield = QWidget()
+            self._shield.setAttribute(Qt.WA_NativeWindow, True)
+            self._shield.setAttribute(Qt.WA_TranslucentBackground, True)
+            self._shield.setAutoFillBackground(False)
+            self._root_layout.addWidget(self._shield)
+        return self._shield
 
     def showEvent(self, event):
         super().showEvent(event)
+        handle = self.window().windowHandle()
+        if handle is not None:
+            screen_tracker().track(handle)
         # Aplicamos lógica nativa
+        mode = GlassTheme.get_current_mode(self)
         if sys.platform == "win32" and self.isWindow():
-             apply_glass_logic(self, self._style, GlassTheme.get_current_mode())
+             apply_glass_logic(self, self._style, mode)
         elif sys.platform == "darwin":
-            apply_glass_logic(self, self._style, GlassTheme.get_current_mode())
+            apply_glass_logic(self, self._style, mode)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._frame_state = 0
+
+    def shown(self):
+        """
+        Awaitable que resuelve cuando el widget está visible, con el efecto nativo
+        aplicado y su primer frame ya en pantalla (p.ej. antes de una captura).
+        """
+        future = create_future()
+        if self._frame_state == 2:
+            resolve(future, self)
+        else:
+            self._shown_waiters.append(future)
+        return future
+
+    def _on_first_frame(self):
+        if not shiboken6.isValid(self) or self._frame_state != 1:
+            return
+        self._frame_state = 2
+        waiters, self._shown_waiters = self._shown_waiters, []
+        for future in waiters:
+            resolve(future, self)
+
+    @contextmanager
+    def batch(self):
+        """
+        Construcción por lotes: sin repintados, sin activar el layout y con el
+        estilado de tema diferido hasta el final. Al salir hay una sola pasada
+        de estilo y una sola de layout.
+
+            with sidebar.batch():
+                for name in names:
+                    sidebar.addWidget(GlassButton(name))
+        """
+        # En macOS también el layout raíz (el que contiene al escudo)
+        layouts = [self._ensure_layout()]
+        if self.layout() is not None and self.layout() is not layouts[0]:
+            layouts.append(self.layout())
+        outermost = self._batch_depth == 0
+        self._batch_depth += 1
+        if outermost:
+            self._batch_updates = self.updatesEnabled()
+            self.setUpdatesEnabled(False)
+            for layout in layouts:
+                layout.setEnabled(False)
+        try:
+            with GlassTheme.deferred_styling():
+                yield self
+        finally:
+            self._batch_depth -= 1
+            if outermost:
+                if self.isVisible():
+                    # Con el padre visible, cada hijo nuevo se muestra activando
+                    # el layout del padre (O(n²) en total). Los mostramos aquí,
+                    # con el layout todavía desactivado.
+                    self._show_pending_children(layouts[0])
+                for layout in reversed(layouts):
+                    layout.setEnabled(True)
+                    layout.activate()
+                self.setUpdatesEnabled(self._batch_updates)
+
+    def _show_pending_children(self, layout):
+        for i in range(layout.count()):
+            widget = layout.itemAt(i).widget()
+            if (widget is not None and widget.isHidden()
+                    and not widget.testAttribute(Qt.WA_WState_ExplicitShowHide)):
+                widget.setVisible(True)
+
+    def setShadow(self, enabled=True, blur=18, offset=(0, 6), color=None):
+        """
+        Sombra del material pintada desde un nine-patch cacheado (ver shadows.py).
+        Se reserva su espacio como márgenes de contenido del widget.
+        Solo en paneles hijos en Windows, donde el tinte lo pintamos nosotros:
+        en macOS, Linux y en ventanas (popovers de nivel superior) no hace nada.
+        """
+        self._shadow = (blur, tuple(offset), color) if enabled else None
+        self._update_shadow_margins()
+        self.update()
+
+    def _update_shadow_margins(self):
+        # Solo donde pintamos el material nosotros (hijos en Windows)
+        reserved = QMargins()
+        if self._shadow is not None and sys.platform == "win32" and not self.isWindow():
+            blur, offset, _ = self._shadow
+            reserved = shadow_margins(blur, offset)
+        if reserved != self._shadow_reserved:
+            self.setContentsMargins(self.contentsMargins() - self._shadow_reserved + reserved)
+            self._shadow_reserved = reserved
+
+    def event(self, event):
+        if event.type() == QEvent.ParentChange:
+            self._update_shadow_margins()
+            self._on_scope_changed(GlassTheme.get_current_mode(self))
+        elif event.type() == QEvent.WinIdChange:
+            # Ventana nativa nueva: hay que volver a aplicar el efecto
+            _APPLIED_GLASS.pop(self, None)
+        elif event.type() == _DPR_CHANGE_EVENT:
+            # Cambio de escala sin cambiar de pantalla (p.ej. el usuario cambió el 125%)
+            handle = self.window().windowHandle()
+            if handle is not None:
+                screen_tracker().refresh(handle)
+        elif self._rasterize and event.type() in _RASTER_INVALIDATING_EVENTS:
+            self._on_subtree_event(event)
+        return super().event(event)
+
+    # --- RASTERIZADO (como shouldRasterize de CALayer) ---
+    def setRasterize(self, enabled):
+        """
+        Cachea el subárbol en un pixmap (al DPR actual) y lo pinta de un blit
+        hasta que cambia un hijo, el tema o el tamaño. Un hijo que se repinta
+        por su cuenta (setValue, setText...) también invalida el cache.
+        Pensado para paneles estáticos; en macOS el contenido vive en un
+        escudo nativo y se ignora.
+        """
+        enabled = bool(enabled) and sys.platform != "darwin"
+        if enabled == self._rasterize:
+            return
+        if enabled and self._raster_timer is None:
+            # Se vuelve a rasterizar cuando el subárbol lleva un rato quieto
+            self._raster_timer = QTimer(self)
+            self._raster_timer.setSingleShot(True)
+            self._raster_timer.timeout.connect(self._rebuild_raster)
+        self._rasterize = enabled
+        if enabled:
+            _RASTERIZED.add(self)
+            for child in self.findChildren(QWidget):
+                child.installEventFilter(self)
+            self.destroyed.connect(lambda _=None, key=id(self): _RASTER_CACHE.discard(key))
+        else:
+            _RASTERIZED.discard(self)
+            for child in self.findChildren(QWidget):
+                child.removeEventFilter(self)
+        self.invalidateRaster()
+
+    def isRasterized(self):
+        return self._rasterize
+
+    def invalidateRaster(self):
+        if self._raster_valid:
+            self._raster_valid = False
+            _RASTER_CACHE.discard(id(self))
+            self._raster_pending.clear()
+            self.update()
+        if self._rasterize:
+            self._raster_timer.start(self.RASTER_SETTLE_MS)
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind == QEvent.Paint:
+            if not self._raster_valid or self._rendering_raster:
+                return False
+            if obj in self._raster_pending:
+                # Ya está en el blit del panel: no se vuelve a pintar encima
+                self._raster_pending.discard(obj)
+                return True
+            # Un hijo (opaco) se repinta solo: su contenido cambió
+            self.invalidateRaster()
+        elif kind in _RASTER_INVALIDATING_EVENTS:
+            self._on_subtree_event(event)
+        return False
+
+    def _on_subtree_event(self, event):
+        if event.type() in (QEvent.ChildAdded, QEvent.ChildRemoved):
+            # Timers, animaciones y demás QObject no cambian lo que se ve
+            if not event.child().isWidgetType():
+                return
+            if event.type() == QEvent.ChildAdded:
+                self._watch_subtree(event.child())
+        self.invalidateRaster()
+
+    def _watch_subtree(self, widget):
+        widget.installEventFilter(self)
+        for child in widget.findChildren(QWidget):
+            child.installEventFilter(self)
+
+    def _raster_state(self):
+        return (self.width(), self.height(), self.devicePixelRatioF(), GlassTheme.get_current_mode(self))
+
+    def _rebuild_raster(self):
+        if not self._rasterize or not self.isVisible() or self.width() <= 0 or self.height() <= 0:
+            return
+        state = self._raster_state()
+        dpr = state[2]
+        pixmap = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        # Fuera de paintEvent: render() no puede anidarse en un pintado
+        self._rendering_raster = True
+        try:
+            self.render(pixmap, QPoint(), QRegion(), QWidget.DrawChildren)
+        finally:
+            self._rendering_raster = False
+        _RASTER_CACHE.put(id(self), pixmap)
+        self._raster_key = state
+        # Los hijos que entren o salgan invalidan el cache: la lista vale hasta entonces
+        self._raster_subtree = frozenset(self.findChildren(QWidget))
+        self._raster_valid = True
+
+    def _paint_raster(self, event):
+        if not self._raster_valid or self._rendering_raster:
+            return False
+        if not self._repaints_whole_panel(event.region()):
+            # Repintado parcial que no pedimos: lo origina un hijo que cambió
+            # (update() de un QLabel, setValue de un QProgressBar...)
+            self.invalidateRaster()
+            return False
+        pixmap = _RASTER_CACHE.get(id(self))
+        if pixmap is None or self._raster_key != self._raster_state():
+            # Expulsado por el límite global, o cambió tamaño/DPR/modo
+            self._raster_valid = False
+            self.invalidateRaster()
+            return False
+        painter = QPainter(self)
+        if sys.platform == "win32" and not self.isWindow():
+            # Igual que _paint_windows_material, que limpia su área antes del tinte
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+        # Qt pintará a continuación los descendientes: eventFilter se los salta
+        self._raster_pending = set(self._raster_subtree)
+        return True
+
+    def _repaints_whole_panel(self, region):
+        missing = QRegion(self.rect()).subtracted(region)
+        if missing.isEmpty():
+            return True
+        # Qt quita del área del padre los hijos opacos (p.ej. un QPlainTextEdit)
+        for child in self.findChildren(QWidget):
+            if child.isVisible() and not child.isWindow():
+                area = QRect(child.mapTo(self, QPoint()), child.size())
+                if not region.intersects(area):
+                    missing = missing.subtracted(QRegion(area))
+        return missing.isEmpty()
+
+    def themeScope(self):
+        return self._theme_scope
+
+    def setThemeScope(self, mode=None, colors=None):
+        """Fija un tema local para este widget y sus hijos (ver ThemeScope)."""
+        if self._theme_scope is not None:
+            self._theme_scope.detach()
+        return ThemeScope(self, mode=mode, colors=colors)
+
+    def _on_scope_changed(self, mode):
+        self._on_mode_changed(mode)
 
     def _on_mode_changed(self, mode):
+        # El modo efectivo puede venir de un ThemeScope ancestro
+        mode = GlassTheme.get_current_mode(self)
+        self.invalidateRaster()
         if sys.platform == "darwin" or (sys.platform == "win32" and self.isWindow()):
             apply_glass_logic(self, self._style, mode)
+
+        fill, border = _material_colors(self._style, mode, self._tint_color)
+        if not (sys.platform == "win32" and not self.isWindow()):
+            # El tinte no se pinta aquí (efecto nativo o ventana Acrylic): nada que animar
+            GlassAnimator.cancel(self)
+            self._fill, self._border = fill, border
+            return
+
+        # Crossfade del tinte (solo donde lo pintamos nosotros)
+        duration = self.THEME_DURATION if self.isVisible() else 0
+        GlassAnimator.animate_color(self, "fill", self._fill, fill, duration)
+        if border is not None:
+            GlassAnimator.animate_color(self, "border", self._border or border, border, duration)
         self.update()
 
+    def _animation_step(self, channel, color):
+        if channel == "fill":
+            self._fill = color
+        elif channel == "border":
+            self._border = color
+        self.update()
+        self.invalidateRaster()
+        _invalidate_raster_ancestors(self)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.invalidateRaster()
+
     def paintEvent(self, event):
+        if self._frame_state == 0:
+            # showEvent ya aplicó el efecto; esperamos a que este pintado se vuelque
+            self._frame_state = 1
+            call_after_frame(self._on_first_frame)
+        if self._rasterize and self._paint_raster(event):
+            return
         if sys.platform == "win32":
             # --- VENTANA MADRE: NO PINTAR (Bypass total para ver el Acrylic) ---
             if self.isWindow():
@@ -261,70 +1111,100 @@ class NativeGlassWidget(QWidget):
         
         # 2. Pintar el Tinte Semitransparente
         painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+
+        mode = GlassTheme.get_current_mode(self)
+        fill, border = _material_colors(self._style, mode, self._tint_color)
+        # Durante un crossfade de tema usamos los colores animados
+        if GlassAnimator.is_animating(self, "fill"):
+            fill = self._fill
+            if border is not None and self._border is not None:
+                border = self._border
+
+        painter.setPen(QPen(border, 1) if border is not None else Qt.NoPen)
+        painter.setBrush(QBrush(fill))
         
-        mode = GlassTheme.get_current_mode()
-        is_dark = (mode == "dark")
-        
-        # --- DEFINICIÓN DE MATERIALES ---
-        
-        # AQUI ESTA EL CAMBIO: Prioridad al color personalizado si existe
-        if self._tint_color is not None:
-            # Si el usuario pasó un tinte, USAMOS ESE
-            color = QColor(self._tint_color)
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(QBrush(color))
-            
-        else:
-            # Si no, usamos los defaults grises de la librería
-            if self._style == GlassStyle.SIDEBAR:
-                # Tinte Sidebar: Gris Oscuro/Claro semitransparente
-                alpha = 150 if is_dark else 180 
-                color = QColor(25, 25, 25, alpha) if is_dark else QColor(245, 245, 245, alpha)
-                painter.setPen(Qt.NoPen)
-                painter.setBrush(QBrush(color))
-                
-            elif self._style == GlassStyle.HEADER:
-                # Header: Muy transparente
-                alpha = 40 
-                color = QColor(20, 20, 20, alpha) if is_dark else QColor(255, 255, 255, alpha)
-                painter.setPen(Qt.NoPen)
-                painter.setBrush(QBrush(color))
-                
-            elif self._style in [GlassStyle.POPOVER, GlassStyle.MENU]:
-                # Popover: Más marcado
-                alpha = 210
-                if is_dark:
-                    color = QColor(40, 40, 40, alpha)
-                    border = QColor(255, 255, 255, 30)
-                else:
-                    color = QColor(255, 255, 255, alpha)
-                    border = QColor(0, 0, 0, 20)
-                painter.setPen(QPen(border, 1))
-                painter.setBrush(QBrush(color))
-                
-            else:
-                alpha = 100
-                color = QColor(128, 128, 128, alpha)
-                painter.setPen(Qt.NoPen)
-                painter.setBrush(QBrush(color))
-        
-        rect = self.rect()
+        rect = self.rect().marginsRemoved(self._shadow_reserved)
         r = self._border_radius
         
         if self._style in [GlassStyle.POPOVER, GlassStyle.MENU]:
              rect = rect.adjusted(1, 1, -1, -1)
              if r == 0: r = 8
+
+        if self._shadow is not None:
+            blur, offset, color = self._shadow
+            paint_shadow(painter, rect, r, blur, color, offset, mode)
              
         painter.drawRoundedRect(rect, r, r)
 
 
+# --- DEFINICIÓN DE MATERIALES ---
+def _material_colors(style, mode, tint_color=None):
+    """Devuelve (relleno, borde) del material; borde es None si no lleva."""
+    is_dark = (mode == "dark")
+
+    # Prioridad al color personalizado si existe
+    if tint_color is not None:
+        return QColor(tint_color), None
+
+    # Si no, usamos los defaults grises de la librería
+    if style == GlassStyle.SIDEBAR:
+        # Tinte Sidebar: Gris Oscuro/Claro semitransparente
+        alpha = 150 if is_dark else 180
+        return (QColor(25, 25, 25, alpha) if is_dark else QColor(245, 245, 245, alpha)), None
+
+    if style == GlassStyle.HEADER:
+        # Header: Muy transparente
+        alpha = 40
+        return (QColor(20, 20, 20, alpha) if is_dark else QColor(255, 255, 255, alpha)), None
+
+    if style in [GlassStyle.POPOVER, GlassStyle.MENU]:
+        # Popover: Más marcado
+        alpha = 210
+        if is_dark:
+            return QColor(40, 40, 40, alpha), QColor(255, 255, 255, 30)
+        return QColor(255, 255, 255, alpha), QColor(0, 0, 0, 20)
+
+    return QColor(128, 128, 128, 100), None
+
+
 # --- LOGICA NATIVA WINDOWS ---
+def _is_window(target_object):
+    # QWindow (p.ej. QQuickWindow) siempre es ventana; QWidget lo dice isWindow()
+    return isinstance(target_object, QWindow) or target_object.isWindow()
+
+# Último efecto aplicado por objeto: widget/ventana -> (winId, estilo, modo).
+# Débil y por objeto, no por winId: Windows reutiliza los HWND de ventanas cerradas.
+_APPLIED_GLASS = weakref.WeakKeyDictionary()
+
+class _NativeHandleWatcher(QObject):
+    """
+    Olvida el efecto aplicado cuando Qt recrea la ventana nativa del objeto
+    (p.ej. al cambiar flags); el handle nuevo puede tener el mismo valor.
+    Un solo filtro para todos: nada de un connect por objeto.
+    """
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.WinIdChange or (
+                event.type() == QEvent.PlatformSurface
+                and event.surfaceEventType() == QPlatformSurfaceEvent.SurfaceAboutToBeDestroyed):
+            _APPLIED_GLASS.pop(obj, None)
+        return False
+
+_HANDLE_WATCHER = _NativeHandleWatcher()
+
 def apply_glass_logic(target_object, style, mode):
     oid = int(target_object.winId())
+    applied = _APPLIED_GLASS.get(target_object)
+    if applied == (oid, style, mode):
+        # Ya tiene exactamente este efecto: repetirlo solo provoca parpadeos
+        return
+    if applied is None and not isinstance(target_object, NativeGlassWidget):
+        # NativeGlassWidget atiende WinIdChange en su propio event()
+        target_object.installEventFilter(_HANDLE_WATCHER)
+    _APPLIED_GLASS[target_object] = (oid, style, mode)
     use_dark = (mode == "dark")
 
     if sys.platform == "darwin":
-        is_window = target_object.isWindow() 
+        is_window = _is_window(target_object)
         if is_window:
             from .mac.window_effect import MacWindowEffect
             effect = MacWindowEffect(target_object)
@@ -336,13 +1216,18 @@ def apply_glass_logic(target_object, style, mode):
 
     elif sys.platform == "win32":
         # SOLO ACTUAMOS EN LA VENTANA MADRE
-        if target_object.isWindow():
+        if _is_window(target_object):
             
             # 1. Configurar Atributos de Transparencia (V3 Success)
-            target_object.setAttribute(Qt.WA_TranslucentBackground, True)
-            target_object.setAttribute(Qt.WA_NoSystemBackground, True)
-            # Inyección de CSS vital
-            target_object.setStyleSheet("background: transparent;")
+            if isinstance(target_object, QWindow):
+                # Qt Quick: fondo transparente para ver el Acrylic
+                if hasattr(target_object, "setColor"):
+                    target_object.setColor(Qt.transparent)
+            else:
+                target_object.setAttribute(Qt.WA_TranslucentBackground, True)
+                target_object.setAttribute(Qt.WA_NoSystemBackground, True)
+                # Inyección de CSS vital
+                target_object.setStyleSheet("background: transparent;")
             
             # 2. Extender Marco al Área Cliente (EL FIX DEL NEGRO)
             margins = MARGINS(-1, -1, -1, -1)
@@ -358,7 +1243,10 @@ def apply_glass_logic(target_object, style, mode):
             dwmapi.DwmSetWindowAttribute(oid, DWMWA_SYSTEMBACKDROP_TYPE, byref(backdrop), sizeof(backdrop))
             
             # Forzar repintado para quitar residuos
-            target_object.repaint()
+            if isinstance(target_object, QWindow):
+                target_object.requestUpdate()
+            else:
+                target_object.repaint()
 
 def apply_glass(target_object, style=GlassStyle.SIDEBAR, mode=None):
     if mode is None:
@@ -0,0 +1,73 @@
+import asyncio
+from collections import deque
+
+from PySide6.QtCore import QObject, QEvent, QCoreApplication, Qt
+
+# Evento propio con prioridad menor que los UpdateRequest de los backing stores:
+# cuando llega, los repintados ya encolados se hicieron y se volcaron a pantalla.
+_FRAME_EVENT = QEvent.Type(QEvent.registerEventType())
+_FRAME_PRIORITY = int(Qt.LowEventPriority.value) - 1
+
+
+class _FrameNotifier(QObject):
+    """Llama callbacks después del frame en curso, sin timers ni processEvents."""
+    def __init__(self):
+        super().__init__()
+        self._callbacks = deque()
+
+    def call_after_frame(self, callback):
+        # Un evento por callback: la cola de Qt es FIFO dentro de la misma prioridad
+        self._callbacks.append(callback)
+        QCoreApplication.postEvent(self, QEvent(_FRAME_EVENT), _FRAME_PRIORITY)
+
+    def event(self, event):
+        if event.type() == _FRAME_EVENT:
+            if self._callbacks:
+                self._callbacks.popleft()()
+            return True
+        return super().event(event)
+
+
+_NOTIFIER = None
+
+
+def call_after_frame(callback):
+    global _NOTIFIER
+    if _NOTIFIER is None:
+        _NOTIFIER = _FrameNotifier()
+    _NOTIFIER.call_after_frame(callback)
+
+
+def create_future():
+    # Requiere un loop de asyncio integrado con el de Qt (QtAsyncio, qasync...)
+    return asyncio.get_running_loop().create_future()
+
+
+def resolve(future, value=None):
+    if not future.done():
+        future.set_result(value)
+
+
+def after_frame():
+    """Future que se resuelve cuando los repintados pendientes llegaron a pantalla."""
+    future = create_future()
+    call_after_frame(lambda: resolve(future))
+    return future
+
+
+def wait_signal(signal):
+    """Future que se resuelve con la próxima emisión de 'signal'."""
+    future = create_future()
+
+    def on_emit(*args):
+        resolve(future, args[0] if len(args) == 1 else args)
+
+    def disconnect(_):
+        try:
+            signal.disconnect(on_emit)
+        except (RuntimeError, TypeError):
+            pass
+
+    signal.connect(on_emit)
+    future.add_done_callback(disconnect)
+    return future
@@ -0,0 +1,124 @@
+import time
+import weakref
+from functools import lru_cache
+
+import shiboken6
+from PySide6.QtCore import QObject, QTimer, Qt, QEasingCurve, Signal
+from PySide6.QtGui import QColor, QGuiApplication
+
+
+@lru_cache(maxsize=256)
+def _color_table(start, end, steps, easing):
+    """
+    Tabla precalculada de colores (QRgb) entre start y end.
+    Se comparte entre todos los widgets que hacen la misma transición
+    (p.ej. todos los botones al cambiar de tema).
+    """
+    curve = QEasingCurve(easing)
+    a, b = QColor.fromRgba(start), QColor.fromRgba(end)
+    ca = (a.red(), a.green(), a.blue(), a.alpha())
+    cb = (b.red(), b.green(), b.blue(), b.alpha())
+    table = []
+    for i in range(steps):
+        t = curve.valueForProgress(i / (steps - 1))
+        r, g, bl, al = (round(x + (y - x) * t) for x, y in zip(ca, cb))
+        table.append(QColor(r, g, bl, al).rgba())
+    return tuple(table)
+
+
+class _Animation:
+    __slots__ = ("target", "channel", "table", "started", "duration", "index")
+
+    def __init__(self, target, channel, table, started, duration):
+        self.target = target
+        self.channel = channel
+        self.table = table
+        self.started = started
+        self.duration = duration
+        self.index = -1
+
+
+class AnimationDriver(QObject):
+    """
+    Motor de animación compartido: un solo timer a la frecuencia de la pantalla
+    avanza todas las transiciones de color activas (hover, cambio de tema).
+    Sin animaciones activas el timer se detiene, el coste es proporcional
+    a lo que se anima y no al número de widgets.
+
+    El destino debe implementar _animation_step(channel, color).
+    """
+    # Se emite al terminar la última animación activa
+    idle = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._timer = None
+        self._active = {}
+
+    def animate_color(self, target, channel, start, end, duration=150, easing=QEasingCurve.OutCubic):
+        start, end = QColor(start), QColor(end)
+        key = (id(target), channel)
+        if duration <= 0 or start.rgba() == end.rgba():
+            self._active.pop(key, None)
+            target._animation_step(channel, end)
+            return
+
+        steps = max(2, round(duration / self._frame_interval()) + 1)
+        table = _color_table(start.rgba(), end.rgba(), steps, easing)
+        self._active[key] = _Animation(weakref.ref(target), channel, table,
+                                       time.perf_counter(), duration / 1000.0)
+        self._ensure_running()
+
+    def cancel(self, target, channel=None):
+        for key in [k for k in self._active if k[0] == id(target) and channel in (None, k[1])]:
+            del self._active[key]
+
+    def is_animating(self, target, channel=None):
+        if channel is not None:
+            return (id(target), channel) in self._active
+        return any(k[0] == id(target) and channel in (None, k[1]) for k in self._active)
+
+    def active_count(self):
+        return len(self._active)
+
+    def is_idle(self):
+        return self._timer is None or not self._timer.isActive()
+
+    # --- INTERNOS ---
+    def _frame_interval(self):
+        screen = QGuiApplication.primaryScreen() if QGuiApplication.instance() else None
+        rate = screen.refreshRate() if screen else 0
+        return 1000.0 / (rate if rate > 0 else 60.0)
+
+    def _ensure_running(self):
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.setTimerType(Qt.PreciseTimer)
+            self._timer.timeout.connect(self._tick)
+        if not self._timer.isActive():
+            self._timer.start(max(1, round(self._frame_interval())))
+
+    def _tick(self):
+        now = time.perf_counter()
+        # Copia: los callbacks pueden lanzar nuevas animaciones
+        for key, anim in list(self._active.items()):
+            target = anim.target()
+            if target is None or not shiboken6.isValid(target):
+                self._active.pop(key, None)
+                continue
+
+            progress = min(1.0, (now - anim.started) / anim.duration)
+            index = round(progress * (len(anim.table) - 1))
+            if index != anim.index:
+                anim.index = index
+                target._animation_step(anim.channel, QColor.fromRgba(anim.table[index]))
+
+            if progress >= 1.0 and self._active.get(key) is anim:
+                del self._active[key]
+
+        if not self._active:
+            self._timer.stop()
+            self.idle.emit()
+
+
+GlassAnimator = AnimationDriver()
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+
+def pixmap_bytes(image):
+    """Memoria aproximada de un QPixmap/QImage (4 bytes por pixel físico)."""
+    if image is None or image.isNull():
+        return 0
+    return image.width() * image.height() * 4
+
+
+class PixmapCache:
+    """
+    Cache LRU acotada por memoria para pixmaps/imágenes rasterizadas.
+    Cuando se supera el presupuesto se expulsan las entradas menos usadas,
+    así la memoria queda acotada sin importar cuántas claves existan.
+    """
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self._entries = OrderedDict()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, image):
+        self.discard(key)
+        size = pixmap_bytes(image)
+        if size > self._max_bytes:
+            # Más grande que todo el presupuesto: no se cachea
+            return image
+        self._entries[key] = (image, size)
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self._bytes -= old_size
+        return image
+
+    def discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def discard_if(self, predicate):
+        for key in [k for k in self._entries if predicate(k)]:
+            self.discard(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def set_max_bytes(self, max_bytes):
+        self._max_bytes = max_bytes
+        while self._bytes > self._max_bytes and self._entries:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self._bytes -= old_size
+
+    def max_bytes(self):
+        return self._max_bytes
+
+    def used_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
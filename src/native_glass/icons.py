@@ -0,0 +1,179 @@
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from PySide6.QtCore import Qt, QRectF, QSize
+from PySide6.QtGui import QIcon, QIconEngine, QImage, QPainter, QPixmap
+from PySide6.QtSvg import QSvgRenderer
+from PySide6.QtWidgets import QWidget
+
+from .cache import PixmapCache
+
+
+class IconAtlas:
+    """
+    Atlas de iconos SVG monocromáticos teñidos con colores semánticos.
+
+    Dos niveles, ambos dentro del mismo presupuesto LRU:
+      * Máscara: el SVG rasterizado una sola vez por (icono, tamaño, dpr).
+      * Tinte: la máscara coloreada por (icono, tamaño, dpr, color resuelto).
+    Un cambio de modo solo vuelve a teñir la máscara, no relee el archivo.
+    Al guardar el color y no el rol, un ThemeScope o un register_color nuevo
+    dan otra clave y nunca se sirve un tinte viejo.
+    """
+    def __init__(self, theme, max_bytes=8 * 1024 * 1024, max_renderers=64):
+        self._theme = theme
+        self._cache = PixmapCache(max_bytes)
+        self._renderers = OrderedDict()
+        self._max_renderers = max_renderers
+        self._painting_widget = None
+
+    @contextmanager
+    def painting(self, widget):
+        """
+        Los estilos piden el icono con QIcon.pixmap(), sin decir para qué widget:
+        dentro del bloque esos pixmaps se tiñen con el ThemeScope de 'widget'.
+        """
+        previous = self._painting_widget
+        self._painting_widget = widget
+        try:
+            yield
+        finally:
+            self._painting_widget = previous
+
+    def pixmap(self, path, role, size, dpr=1.0, mode=None, icon_mode=QIcon.Normal, widget=None):
+        # Con widget, el modo y el color salen de su ThemeScope
+        if widget is None:
+            widget = self._painting_widget
+        color = self._theme.get_color(role, mode=mode, widget=widget)
+        w, h = size.width(), size.height()
+        key = ("tint", path, w, h, dpr, color.rgba(), icon_mode)
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        mask = self._mask(path, w, h, dpr)
+        if mask is None:
+            return QPixmap()
+
+        image = QImage(mask)
+        painter = QPainter(image)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+        painter.fillRect(image.rect(), color)
+        painter.end()
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        if icon_mode == QIcon.Disabled:
+            pixmap = self._faded(pixmap, 0.4)
+        return self._cache.put(key, pixmap)
+
+    def purge_dprs(self, keep):
+        # Máscaras y tintes guardan el dpr en la misma posición
+        self._cache.discard_if(lambda k: k[4] not in keep)
+
+    def invalidate_path(self, path):
+        self._cache.discard_if(lambda k: k[1] == path)
+        self._renderers.pop(path, None)
+
+    def clear(self):
+        self._cache.clear()
+        self._renderers.clear()
+
+    def set_max_bytes(self, max_bytes):
+        self._cache.set_max_bytes(max_bytes)
+
+    def used_bytes(self):
+        return self._cache.used_bytes()
+
+    def __len__(self):
+        return len(self._cache)
+
+    # --- INTERNOS ---
+    def _mask(self, path, w, h, dpr):
+        key = ("mask", path, w, h, dpr)
+        mask = self._cache.get(key)
+        if mask is not None:
+            return mask
+
+        renderer = self._renderer(path)
+        if renderer is None:
+            return None
+
+        image = QImage(max(1, round(w * dpr)), max(1, round(h * dpr)),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        renderer.render(painter, self._fit(renderer.defaultSize(), image.width(), image.height()))
+        painter.end()
+        return self._cache.put(key, image)
+
+    def _renderer(self, path):
+        renderer = self._renderers.get(path)
+        if renderer is not None:
+            self._renderers.move_to_end(path)
+            return renderer
+        if not os.path.exists(path):
+            return None
+        renderer = QSvgRenderer(path)
+        if not renderer.isValid():
+            return None
+        self._renderers[path] = renderer
+        if len(self._renderers) > self._max_renderers:
+            self._renderers.popitem(last=False)
+        return renderer
+
+    @staticmethod
+    def _fit(source, w, h):
+        # Respeta la proporción del SVG y lo centra en el área destino
+        if source.isEmpty():
+            return QRectF(0, 0, w, h)
+        scale = min(w / source.width(), h / source.height())
+        sw, sh = source.width() * scale, source.height() * scale
+        return QRectF((w - sw) / 2, (h - sh) / 2, sw, sh)
+
+    @staticmethod
+    def _faded(pixmap, opacity):
+        faded = QPixmap(pixmap.size())
+        faded.setDevicePixelRatio(pixmap.devicePixelRatio())
+        faded.fill(Qt.transparent)
+        painter = QPainter(faded)
+        painter.setOpacity(opacity)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+        return faded
+
+
+class GlassIconEngine(QIconEngine):
+    """
+    Motor de QIcon que pide sus pixmaps al IconAtlas.
+    El color se resuelve en cada pintado, así el icono sigue al tema sin recargar;
+    si se pinta sobre un widget, respeta su ThemeScope.
+    """
+    def __init__(self, atlas, path, role="palette(text)"):
+        super().__init__()
+        self._atlas = atlas
+        self._path = path
+        self._role = role
+
+    def paint(self, painter, rect, mode, state):
+        device = painter.device()
+        dpr = device.devicePixelRatioF() if device else 1.0
+        widget = device if isinstance(device, QWidget) else None
+        pixmap = self._atlas.pixmap(self._path, self._role, QSize(rect.size()), dpr,
+                                    icon_mode=mode, widget=widget)
+        painter.drawPixmap(rect, pixmap)
+
+    def pixmap(self, size, mode, state):
+        return self.scaledPixmap(size, mode, state, 1.0)
+
+    def scaledPixmap(self, size, mode, state, scale):
+        # Qt 6 pasa el tamaño ya en píxeles físicos; el atlas trabaja en lógicos
+        return self._atlas.pixmap(self._path, self._role, QSize(size) / scale, scale, icon_mode=mode)
+
+    def clone(self):
+        return GlassIconEngine(self._atlas, self._path, self._role)
+
+    def key(self):
+        return "GlassIconEngine"
@@ -0,0 +1,372 @@
+import sys
+import math
+import weakref
+from collections import OrderedDict
+
+import shiboken6
+
+from PySide6.QtCore import Qt, QObject, QRectF, Signal, Slot, Property
+from PySide6.QtGui import QColor, QImage, QPainter, QPen
+from PySide6.QtQuick import QQuickItem, QSGNode
+
+from . import GlassTheme, GlassStyle, apply_glass, _material_colors
+from .cache import PixmapCache
+from .screens import screen_tracker
+
+# Imágenes base del nine-patch compartidas por todas las ventanas:
+# (relleno, borde, radio, dpr) -> QImage
+_PATCH_IMAGES = PixmapCache(max_bytes=2 * 1024 * 1024)
+
+# Ventanas Qt Quick con efecto nativo aplicado (uno por ventana, no por item)
+_GLASS_WINDOWS = weakref.WeakKeyDictionary()
+
+
+def glass_window(window, style=GlassStyle.FULL):
+    """
+    Aplica el efecto nativo a una QQuickWindow una sola vez, compartido con apply_glass.
+    Se vuelve a aplicar solo en cambios de modo, no por cada GlassRectangle.
+    """
+    first = window not in _GLASS_WINDOWS
+    _GLASS_WINDOWS[window] = style
+    screen_tracker().track(window)
+    if sys.platform not in ["darwin", "win32"]:
+        return
+    if window.isVisible():
+        apply_glass(window, style)
+    elif first:
+        window.visibleChanged.connect(lambda visible, w=window: _on_window_visible(w, visible))
+
+
+def _on_window_visible(window, visible):
+    if visible and window in _GLASS_WINDOWS:
+        apply_glass(window, _GLASS_WINDOWS[window])
+
+
+def _reapply_windows(mode):
+    if sys.platform not in ["darwin", "win32"]:
+        return
+    for window, style in list(_GLASS_WINDOWS.items()):
+        if window.isVisible():
+            apply_glass(window, style, mode)
+
+
+GlassTheme.mode_changed.connect(_reapply_windows)
+screen_tracker().add_purger(lambda keep: _PATCH_IMAGES.discard_if(lambda k: k[3] not in keep))
+
+
+class _WindowTextures:
+    """
+    Texturas del nine-patch de una ventana; se liberan con su scene graph.
+    Las que ningún item usa quedan en un LRU acotado: animar tintColor crea
+    una textura por frame y no deben vivir lo que dura la ventana.
+    """
+    MAX_UNUSED_BYTES = 2 * 1024 * 1024
+
+    def __init__(self, window):
+        self._textures = OrderedDict()
+        self._users = {}
+        window.sceneGraphInvalidated.connect(self._clear)
+
+    def acquire(self, window, key):
+        # Hilo de render (updatePaintNode): el único sitio donde se borran texturas
+        texture = self._textures.get(key)
+        if texture is None:
+            texture = window.createTextureFromImage(_patch_image(*key))
+            self._textures[key] = texture
+        else:
+            self._textures.move_to_end(key)
+        self._users[key] = self._users.get(key, 0) + 1
+        self._evict()
+        return texture
+
+    def release(self, key):
+        # Solo descuenta: una textura en uso por otro item no se puede borrar
+        count = self._users.get(key, 0) - 1
+        if count > 0:
+            self._users[key] = count
+        else:
+            self._users.pop(key, None)
+
+    def __len__(self):
+        return len(self._textures)
+
+    def _evict(self):
+        unused = [key for key in self._textures if key not in self._users]
+        used_bytes = sum(self._texture_bytes(self._textures[key]) for key in unused)
+        for key in unused:
+            if used_bytes <= self.MAX_UNUSED_BYTES:
+                break
+            texture = self._textures.pop(key)
+            used_bytes -= self._texture_bytes(texture)
+            # createTextureFromImage no cede la propiedad a Python: soltarla no la libera
+            shiboken6.delete(texture)
+
+    def _clear(self):
+        # Hilo de render, con el scene graph ya sin nodos
+        for texture in self._textures.values():
+            shiboken6.delete(texture)
+        self._textures.clear()
+        self._users.clear()
+
+    @staticmethod
+    def _texture_bytes(texture):
+        size = texture.textureSize()
+        return size.width() * size.height() * 4
+
+
+def _window_textures(window):
+    textures = getattr(window, "_glass_textures", None)
+    if textures is None:
+        textures = _WindowTextures(window)
+        window._glass_textures = textures
+    return textures
+
+
+def _release_texture(use):
+    textures, key = use
+    if textures is not None:
+        textures.release(key)
+    use[:] = [None, None]
+
+
+class _TextureReleaser(QObject):
+    """
+    Un único slot para el destroyed de todos los items: un lambda por item
+    encarece cada connect siguiente y crear N items sale cuadrático.
+    """
+    def __init__(self):
+        super().__init__()
+        # puntero C++ del item -> [texturas de la ventana, clave en uso]
+        self._uses = {}
+
+    def watch(self, item, use):
+        self._uses[shiboken6.getCppPointer(item)[0]] = use
+        item.destroyed.connect(self._on_destroyed)
+
+    @Slot(QObject)
+    def _on_destroyed(self, item):
+        use = self._uses.pop(shiboken6.getCppPointer(item)[0], None)
+        if use is not None:
+            _release_texture(use)
+
+
+_TEXTURE_RELEASER = _TextureReleaser()
+
+
+def _patch_margin(radius):
+    # Un píxel extra para el borde/antialiasing
+    return int(math.ceil(radius)) + 1
+
+
+def _patch_image(fill, border, radius, dpr):
+    key = (fill, border, radius, dpr)
+    image = _PATCH_IMAGES.get(key)
+    if image is not None:
+        return image
+
+    m = _patch_margin(radius)
+    side = 2 * m + 1
+    image = QImage(round(side * dpr), round(side * dpr), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.scale(dpr, dpr)
+    painter.setBrush(QColor.fromRgba(fill))
+    if border is not None:
+        painter.setPen(QPen(QColor.fromRgba(border), 1))
+        rect = QRectF(0.5, 0.5, side - 1, side - 1)
+    else:
+        painter.setPen(Qt.NoPen)
+        rect = QRectF(0, 0, side, side)
+    painter.drawRoundedRect(rect, radius, radius)
+    painter.end()
+    return _PATCH_IMAGES.put(key, image)
+
+
+class GlassRectangle(QQuickItem):
+    """
+    Tarjeta de cristal para QML con los mismos materiales que NativeGlassWidget.
+
+    El nodo del scene graph (un nine-patch de 9 QSGImageNode) se guarda entre frames
+    y solo se toca cuando cambia el material, el modo, el tamaño o el radio.
+    La textura se comparte entre todos los items iguales de la misma ventana.
+    """
+    materialChanged = Signal()
+    radiusChanged = Signal()
+    tintColorChanged = Signal()
+    colorRoleChanged = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFlag(QQuickItem.ItemHasContents, True)
+        self._material = GlassStyle.SIDEBAR
+        self._radius = 0.0
+        self._tint_color = QColor()
+        self._color_role = ""
+        self._texture_dirty = True
+        self._geometry_dirty = True
+        self._patch_dpr = 1.0
+        self._patch_colors = None
+        # [texturas de la ventana, clave en uso]; compartido con _TEXTURE_RELEASER
+        self._texture_use = [None, None]
+        _TEXTURE_RELEASER.watch(self, self._texture_use)
+        GlassTheme.mode_changed.connect(self._on_mode_changed)
+        self._resolve_colors()
+
+    # --- PROPIEDADES ---
+    def get_material(self):
+        return self._material.value
+
+    def set_material(self, value):
+        style = GlassStyle(value)
+        if style != self._material:
+            self._material = style
+            self._invalidate_texture()
+            self.materialChanged.emit()
+
+    def get_radius(self):
+        return self._radius
+
+    def set_radius(self, value):
+        if value != self._radius:
+            self._radius = value
+            self._invalidate_texture()
+            self.radiusChanged.emit()
+
+    def get_tint_color(self):
+        return self._tint_color
+
+    def set_tint_color(self, value):
+        value = QColor(value)
+        if value != self._tint_color:
+            self._tint_color = value
+            self._invalidate_texture()
+            self.tintColorChanged.emit()
+
+    def get_color_role(self):
+        return self._color_role
+
+    def set_color_role(self, value):
+        if value != self._color_role:
+            self._color_role = value
+            self._invalidate_texture()
+            self.colorRoleChanged.emit()
+
+    material = Property(str, get_material, set_material, notify=materialChanged)
+    radius = Property(float, get_radius, set_radius, notify=radiusChanged)
+    tintColor = Property(QColor, get_tint_color, set_tint_color, notify=tintColorChanged)
+    colorRole = Property(str, get_color_role, set_color_role, notify=colorRoleChanged)
+
+    # --- SCENE GRAPH ---
+    def updatePaintNode(self, node, data):
+        window = self.window()
+        if window is None:
+            return node
+
+        if node is None:
+            node = QSGNode()
+            for _ in range(9):
+                patch = window.createImageNode()
+                patch.setOwnsTexture(False)
+                node.appendChildNode(patch)
+            self._texture_dirty = True
+
+        if not self._texture_dirty and not self._geometry_dirty:
+            return node
+
+        dpr = window.effectiveDevicePixelRatio()
+        if self._texture_dirty:
+            key = self._patch_key(dpr)
+            textures = _window_textures(window)
+            texture = textures.acquire(window, key)
+            _release_texture(self._texture_use)
+            self._texture_use[:] = [textures, key]
+            patch = node.firstChild()
+            while patch is not None:
+                patch.setTexture(texture)
+                patch = patch.nextSibling()
+            self._patch_dpr = dpr
+
+        self._layout_patches(node, self._patch_dpr)
+        self._texture_dirty = False
+        self._geometry_dirty = False
+        return node
+
+    def geometryChange(self, new_geometry, old_geometry):
+        super().geometryChange(new_geometry, old_geometry)
+        if new_geometry.size() != old_geometry.size():
+            self._geometry_dirty = True
+            self.update()
+
+    def itemChange(self, change, value):
+        super().itemChange(change, value)
+        if change == QQuickItem.ItemSceneChange:
+            # La textura era de la ventana anterior
+            _release_texture(self._texture_use)
+        if change == QQuickItem.ItemSceneChange and self.window() is not None:
+            window = self.window()
+            if window not in _GLASS_WINDOWS:
+                glass_window(window)
+            # Una ventana nueva implica texturas nuevas
+            self._invalidate_texture()
+        elif change == QQuickItem.ItemDevicePixelRatioHasChanged:
+            self._invalidate_texture()
+
+    # --- INTERNOS ---
+    def _on_mode_changed(self, mode):
+        self._invalidate_texture()
+
+    def _on_colors_changed(self):
+        # GlassTheme avisa cuando cambia el rol de colorRole (p.ej. register_color)
+        self._invalidate_texture()
+
+    def _invalidate_texture(self):
+        self._resolve_colors()
+        self._texture_dirty = True
+        self.update()
+
+    def _resolve_colors(self):
+        # En el hilo de GUI: updatePaintNode (hilo de render) solo lee el resultado
+        if self._color_role:
+            with GlassTheme.tracking(self):
+                fill, border = GlassTheme.get_color(self._color_role), None
+        else:
+            tint = self._tint_color if self._tint_color.isValid() else None
+            fill, border = _material_colors(self._material, GlassTheme.get_current_mode(), tint)
+        self._patch_colors = (fill.rgba(), border.rgba() if border is not None else None)
+
+    def _patch_key(self, dpr):
+        fill, border = self._patch_colors
+        return (fill, border, self._effective_radius(), dpr)
+
+    def _effective_radius(self):
+        # Igual que NativeGlassWidget: popover/menu redondeados por defecto
+        if self._material in [GlassStyle.POPOVER, GlassStyle.MENU] and self._radius == 0:
+            return 8
+        return self._radius
+
+    def _layout_patches(self, node, dpr):
+        w, h = self.width(), self.height()
+        m = _patch_margin(self._effective_radius())
+        # Esquinas recortadas si el item es más chico que el patch
+        mx, my = min(m, w / 2), min(m, h / 2)
+
+        src = [0, m * dpr, (m + 1) * dpr, (2 * m + 1) * dpr]
+        src_w = [m * dpr, dpr, m * dpr]
+        dst_x = [(0, mx), (mx, w - 2 * mx), (w - mx, mx)]
+        dst_y = [(0, my), (my, h - 2 * my), (h - my, my)]
+
+        patch = node.firstChild()
+        for row in range(3):
+            for col in range(3):
+                x, pw = dst_x[col]
+                y, ph = dst_y[row]
+                patch.setRect(QRectF(x, y, max(0.0, pw), max(0.0, ph)))
+                patch.setSourceRect(QRectF(src[col], src[row], src_w[col], src_w[row]))
+                patch = patch.nextSibling()
+
+
+def register_qml_types(uri="NativeGlass", major=1, minor=0):
+    """Registra GlassRectangle para usarlo como 'import NativeGlass' en QML."""
+    from PySide6.QtQml import qmlRegisterType
+    qmlRegisterType(GlassRectangle, uri, major, minor, "GlassRectangle")
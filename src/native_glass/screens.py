@@ -0,0 +1,112 @@
+import sys
+
+import shiboken6
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QWindow
+
+
+def window_dpr(window):
+    """
+    DPR con el que Qt pinta la ventana (QWindow): el mismo que devicePixelRatioF()
+    de sus widgets, y por tanto el que llevan las claves de los caches.
+    """
+    return window.devicePixelRatio()
+
+
+def _system_dpr(window):
+    # Windows conoce el monitor nuevo (GetDpiForWindow) antes de que Qt reescale.
+    # Solo sirve para saber que hubo un cambio, no para indexar caches.
+    if sys.platform == "win32" and window.handle() is not None:
+        from .windows.win32_utils import get_dpi_for_window
+        return get_dpi_for_window(int(window.winId())) / 96.0
+    return None
+
+
+class ScreenTracker(QObject):
+    """
+    Sigue el DPR de la pantalla en la que está cada ventana con cristal.
+    Cuando una ventana cambia a un monitor con otro DPR se emite dpr_changed solo
+    para ella, y se purgan de los caches los DPR que ya no usa ninguna ventana.
+    """
+    # (QWindow, dpr anterior, dpr nuevo)
+    dpr_changed = Signal(QWindow, float, float)
+
+    def __init__(self):
+        super().__init__()
+        self._windows = {}
+        self._purgers = []
+
+    def track(self, window):
+        """Empieza a seguir una QWindow (idempotente)."""
+        key = self._key(window)
+        if key in self._windows:
+            return
+        self._windows[key] = [window, window_dpr(window), _system_dpr(window)]
+        window.screenChanged.connect(lambda _screen, k=key: self._check(k))
+        window.destroyed.connect(lambda _=None, k=key: self._forget(k))
+
+    def refresh(self, window):
+        """Vuelve a mirar la ventana (p.ej. tras un DevicePixelRatioChange sin cambio de pantalla)."""
+        key = self._key(window)
+        if key in self._windows:
+            self._check(key)
+
+    def is_tracked(self, window):
+        return self._key(window) in self._windows
+
+    def dpr(self, window):
+        entry = self._windows.get(self._key(window))
+        return entry[1] if entry is not None else window_dpr(window)
+
+    def active_dprs(self):
+        return {entry[1] for entry in self._windows.values()}
+
+    def add_purger(self, purger):
+        """purger(keep) descarta las entradas cuyo DPR no está en el conjunto 'keep'."""
+        self._purgers.append(purger)
+
+    # --- INTERNOS ---
+    @staticmethod
+    def _key(window):
+        return shiboken6.getCppPointer(window)[0]
+
+    def _check(self, key):
+        entry = self._windows.get(key)
+        if entry is None:
+            return
+        window, old_dpr, old_system = entry
+        if not shiboken6.isValid(window):
+            self._forget(key)
+            return
+        entry[2] = _system_dpr(window)
+        new_dpr = window_dpr(window)
+        if new_dpr == old_dpr:
+            if entry[2] != old_system:
+                # El sistema ya cambió de escala y Qt todavía no: se mira otra vez
+                QTimer.singleShot(0, lambda: self._check(key))
+            # Mismo DPR (p.ej. dos monitores iguales): lo cacheado sigue valiendo
+            return
+        entry[1] = new_dpr
+        self.dpr_changed.emit(window, old_dpr, new_dpr)
+        self._purge()
+
+    def _forget(self, key):
+        if self._windows.pop(key, None) is not None:
+            self._purge()
+
+    def _purge(self):
+        if not self._windows:
+            return
+        keep = self.active_dprs()
+        for purger in self._purgers:
+            purger(keep)
+
+
+_TRACKER = None
+
+
+def screen_tracker():
+    global _TRACKER
+    if _TRACKER is None:
+        _TRACKER = ScreenTracker()
+    return _TRACKER
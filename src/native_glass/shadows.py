@@ -0,0 +1,123 @@
+import math
+
+from PySide6.QtCore import Qt, QRectF, QMargins
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect
+
+from .cache import PixmapCache
+
+# Nine-patches de sombra ya difuminados: (radio, blur, color, modo, dpr, offset) -> QPixmap
+_SHADOWS = PixmapCache(max_bytes=4 * 1024 * 1024)
+
+
+def shadow_cache():
+    return _SHADOWS
+
+
+def purge_dprs(keep):
+    # Sombras rasterizadas para pantallas en las que ya no queda ninguna ventana
+    _SHADOWS.discard_if(lambda k: k[4] not in keep)
+
+
+def default_shadow_color(mode):
+    # En oscuro la sombra necesita más opacidad para notarse
+    return QColor(0, 0, 0, 120) if mode == "dark" else QColor(0, 0, 0, 60)
+
+
+def shadow_margins(blur, offset=(0, 0)):
+    """Espacio que ocupa la sombra alrededor de la tarjeta (para reservarlo en el widget)."""
+    dx, dy = offset
+    return QMargins(max(0, blur - dx), max(0, blur - dy), max(0, blur + dx), max(0, blur + dy))
+
+
+def shadow_pixmap(radius, blur, color, mode, dpr=1.0, offset=(0, 0)):
+    """
+    Nine-patch de la sombra de un rectángulo redondeado.
+    El difuminado se hace una sola vez por clave; después pintar cuesta 9 blits.
+    La forma de la tarjeta va recortada: los materiales son translúcidos y la
+    sombra no debe verse a través de ellos.
+    """
+    color = QColor(color)
+    dx, dy = offset
+    key = (radius, blur, color.rgba(), mode, dpr, (dx, dy))
+    pixmap = _SHADOWS.get(key)
+    if pixmap is not None:
+        return pixmap
+
+    corner = _corner_size(radius, blur)
+    side = 2 * corner + 1
+    size = round(side * dpr)
+
+    # 1. Rectángulo redondeado con margen de 'blur' a cada lado
+    shape = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    shape.fill(Qt.transparent)
+    painter = QPainter(shape)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.scale(dpr, dpr)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(color)
+    painter.drawRoundedRect(QRectF(blur, blur, side - 2 * blur, side - 2 * blur), radius, radius)
+    painter.end()
+
+    # 2. Difuminado (una vez) con el blur de Qt
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(shape))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur * dpr)
+    effect.setBlurHints(QGraphicsBlurEffect.QualityHint)
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+
+    blurred = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    blurred.fill(Qt.transparent)
+    painter = QPainter(blurred)
+    scene.render(painter, QRectF(0, 0, size, size), QRectF(0, 0, size, size))
+
+    # 3. Hueco con la forma de la tarjeta (desplazada al revés que la sombra)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.scale(dpr, dpr)
+    painter.setCompositionMode(QPainter.CompositionMode_DestinationOut)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(Qt.black)
+    painter.drawRoundedRect(QRectF(blur - dx, blur - dy, side - 2 * blur, side - 2 * blur), radius, radius)
+    painter.end()
+
+    pixmap = QPixmap.fromImage(blurred)
+    pixmap.setDevicePixelRatio(dpr)
+    return _SHADOWS.put(key, pixmap)
+
+
+def paint_shadow(painter, rect, radius, blur, color=None, offset=(0, 0), mode="light"):
+    """Pinta la sombra de la tarjeta 'rect' (coordenadas lógicas) con el nine-patch cacheado."""
+    if blur <= 0:
+        return
+    if color is None:
+        color = default_shadow_color(mode)
+    device = painter.device()
+    dpr = device.devicePixelRatioF() if device is not None else 1.0
+    pixmap = shadow_pixmap(radius, blur, color, mode, dpr, offset)
+
+    rect = QRectF(rect).translated(*offset).adjusted(-blur, -blur, blur, blur)
+    corner = _corner_size(radius, blur)
+    cx = min(corner, rect.width() / 2)
+    cy = min(corner, rect.height() / 2)
+
+    # Origen en píxeles físicos del nine-patch: esquina, 1px estirable, esquina
+    src = [0, corner * dpr, (corner + 1) * dpr]
+    src_len = [corner * dpr, dpr, corner * dpr]
+    dst_x = [rect.left(), rect.left() + cx, rect.right() - cx]
+    dst_w = [cx, rect.width() - 2 * cx, cx]
+    dst_y = [rect.top(), rect.top() + cy, rect.bottom() - cy]
+    dst_h = [cy, rect.height() - 2 * cy, cy]
+
+    for row in range(3):
+        for col in range(3):
+            if dst_w[col] <= 0 or dst_h[row] <= 0:
+                continue
+            painter.drawPixmap(QRectF(dst_x[col], dst_y[row], dst_w[col], dst_h[row]), pixmap,
+                               QRectF(src[col], src[row], src_len[col], src_len[row]))
+
+
+def _corner_size(radius, blur):
+    # La zona estirable debe quedar fuera del alcance del blur de las esquinas
+    return int(math.ceil(2 * blur + radius))